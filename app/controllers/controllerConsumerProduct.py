@@ -7,6 +7,9 @@ from app.services.scraperProducts.webScraperLaAnonima import (
 from app.services.scraperProducts.webScraperMasOnline import (
     fetch_data_layer_items as fetch_masOnline,
 )
+from app.services.backgroundLoop import run_sync
+from app.services.providerRunner import run_provider
+from app.services.metodosGenericos import combinar
 import asyncio
 import logging
 
@@ -19,41 +22,43 @@ PROVEEDORES = {
 }
 
 
-def fetch_all_products(search: str, limit: int = 50):
-    async def safe_call(coro, timeout=15):
+def fetch_all_products(search: str, limit: int = 50, use_cache: bool = True, allow_stale: bool = True,
+                       orden: str = "relevance", agrupar: bool = False):
+    async def safe_call(proveedor):
+        # el timeout de cada proveedor lo aplica run_provider según su latencia reciente
         try:
-            return await asyncio.wait_for(coro, timeout=timeout)
+            return await run_provider(proveedor, PROVEEDORES[proveedor], search, 7, use_cache, allow_stale)
         except Exception as e:
-            logger.warning(f"[fetch_all_products] Error en {coro.__name__}: {e}")
+            logger.warning(f"[fetch_all_products] Error en {proveedor}: {e}")
             return []
 
     async def gather_all():
         tasks = [
-            safe_call(fetch_laanonima(search, 7), timeout=15),
-            safe_call(fetch_carrefour(search, 7), timeout=12),
-            safe_call(fetch_masOnline(search, 7), timeout=10),
+            safe_call("laanonima"),
+            safe_call("carrefour"),
+            safe_call("masonline"),
         ]
 
         results = await asyncio.gather(*tasks, return_exceptions=False)
-        all_items = [
-            item for sublist in results for item in sublist if isinstance(sublist, list)
-        ]
-        return all_items[:limit]
+        listas = [sublist for sublist in results if isinstance(sublist, list)]
+        # los `limit` mejores según `orden` entre los tres proveedores
+        return combinar(listas, limit, orden, agrupar)
 
-    return asyncio.run(gather_all())
+    return run_sync(gather_all())
 
 
 # funcion para la busqueda por proveedor en especifico
-def fetch_products_proveedor(proveedor: str, search: str, limit: int = 20):
+def fetch_products_proveedor(proveedor: str, search: str, limit: int = 20, use_cache: bool = True, allow_stale: bool = True):
 
     # esto devuelve el metodo scrapper de cada proveedor
     scraper = PROVEEDORES.get(proveedor)
     if not scraper:
         raise RuntimeError(f"Proveedor '{proveedor.lower()}' no soportado")
 
-    # esto es para comprobar si es un metodo async o sync del scraper
-    if asyncio.iscoroutinefunction(scraper):
-        # realiza la busqueda en el proveedor en especifico
-        return asyncio.run(scraper(search, limit))
-    else:
-        return scraper(search, limit)
+    # realiza la busqueda en el proveedor en especifico (run_provider resuelve si es async o sync);
+    # si el scraper falla, vence su timeout o tiene el circuito abierto se devuelve []
+    try:
+        return run_sync(run_provider(proveedor, scraper, search, limit, use_cache, allow_stale))
+    except Exception as e:
+        logger.warning(f"[fetch_products_proveedor] Error en {proveedor}: {e}")
+        return []
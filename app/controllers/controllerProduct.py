@@ -8,7 +8,12 @@ from app.services.webScraperCFernandes import (
     fetch_data_items as fetch_data_items_cfernandes,
 )
 from app.services.webScraperParren import fetch_data_items as fetch_data_items_parren
+from app.services.backgroundLoop import iter_sync, run_sync
+from app.services.circuitBreaker import CircuitOpenError
+from app.services.metodosGenericos import combinar
+from app.services.providerRunner import run_provider
 import asyncio
+import time
 
 # Diccionario de funciones por proveedor
 PROVEEDORES = {
@@ -29,41 +34,67 @@ CIUDAD_PROVEEDORES = {
 }
 
 
-def fetch_all_products(search: str, limit: int = 50):
+async def gather_providers(proveedores, search: str, provider_limit: int,
+                           use_cache: bool = True, allow_stale: bool = True, deadline_ms: int = None):
+    """
+    Consulta los proveedores en paralelo y devuelve `(listas, pendientes, fallidos)`,
+    con la lista de productos de cada proveedor que respondió y en `fallidos` los
+    que fallaron o tenían el circuito abierto.
+
+    Con `deadline_ms` solo se espera hasta ese plazo: se devuelven los productos
+    de los proveedores que ya terminaron y en `pendientes` los que no llegaron.
+    Esos siguen corriendo en el loop compartido y, al terminar, llenan la cache.
+    """
+    tasks = {
+        asyncio.ensure_future(
+            run_provider(proveedor, PROVEEDORES[proveedor], search, provider_limit, use_cache, allow_stale)
+        ): proveedor
+        for proveedor in proveedores
+        if proveedor in PROVEEDORES
+    }
+    if not tasks:
+        return [], [], []
+
+    timeout = deadline_ms / 1000 if deadline_ms is not None else None
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    # Filtrar errores, en el orden de los proveedores
+    listas = []
+    fallidos = []
+    for task, proveedor in tasks.items():
+        if task not in done:
+            continue
+        if task.exception() is not None:
+            print(f"Error en scraper {proveedor}: {task.exception()}")
+            fallidos.append(proveedor)
+        elif isinstance(task.result(), list):
+            listas.append(task.result())
+
+    return listas, [tasks[task] for task in tasks if task in pending], fallidos
+
+
+def fetch_all_products(search: str, limit: int = 50, use_cache: bool = True, allow_stale: bool = True,
+                       deadline_ms: int = None, orden: str = "relevance", agrupar: bool = False):
+    """
+    Devuelve `(productos, pendientes, fallidos)` con los productos combinados
+    según `combinar` (metodosGenericos); ver `gather_providers`.
+    """
     search = search.lower()
 
     async def gather_all():
-        tasks = []
-        sync_results = []
+        # Todos los proveedores en paralelo: run_provider corre los sync en un pool de hilos
+        listas, pendientes, fallidos = await gather_providers(
+            list(PROVEEDORES), search, 7, use_cache, allow_stale, deadline_ms
+        )
+        return combinar(listas, limit, orden, agrupar), pendientes, fallidos
 
-        # Iterar sobre todos los proveedores
-        for proveedor, scraper in PROVEEDORES.items():
-            if asyncio.iscoroutinefunction(scraper):
-                # async → agregar a tasks
-                tasks.append(scraper(search, 7))
-            else:
-                # sync → ejecutar directamente
-                try:
-                    sync_results.append(scraper(search, 7))
-                except Exception as e:
-                    print(f"Error en scraper {proveedor}: {e}")
-
-        # Ejecutar async en paralelo
-        async_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Flatten y filtrar
-        all_items = []
-        for sublist in async_results + sync_results:
-            if isinstance(sublist, list):
-                all_items.extend(sublist)
-
-        return all_items[:limit]
-
-    return asyncio.run(gather_all())
+    return run_sync(gather_all())
 
 
 # funcion para la busqueda por proveedor en especifico
-def fetch_products_proveedor(proveedor: str, search: str, limit: int = 20):
+def fetch_products_proveedor(proveedor: str, search: str, limit: int = 20, use_cache: bool = True, allow_stale: bool = True):
     search = search.lower()
     proveedor = proveedor.lower()
 
@@ -72,17 +103,19 @@ def fetch_products_proveedor(proveedor: str, search: str, limit: int = 20):
     if not scraper:
         raise RuntimeError(f"Proveedor '{proveedor}' no soportado")
 
-    # esto es para comprobar si es un metodo async o sync del scraper
-    if asyncio.iscoroutinefunction(scraper):
-        # realiza la busqueda en el proveedor en especifico
-        return asyncio.run(scraper(search, limit))
-    else:
-        return scraper(search, limit)
+    # realiza la busqueda en el proveedor en especifico (run_provider resuelve si es async o sync);
+    # si el scraper falla, vence su timeout o tiene el circuito abierto se devuelve []
+    try:
+        return run_sync(run_provider(proveedor, scraper, search, limit, use_cache, allow_stale))
+    except Exception as e:
+        print(f"Error en scraper {proveedor}: {e}")
+        return []
 
 
 # funcion para la busqueda por ciudad
-def fetch_products_by_ciudad(ciudad: str, search: str, limit: int = 20):
-
+def fetch_products_by_ciudad(ciudad: str, search: str, limit: int = 20, use_cache: bool = True, allow_stale: bool = True,
+                             deadline_ms: int = None, orden: str = "relevance", agrupar: bool = False):
+    """Devuelve `(productos, pendientes, fallidos)`, igual que `fetch_all_products`."""
     ciudad = ciudad.lower()
     search = search.lower()
 
@@ -92,29 +125,81 @@ def fetch_products_by_ciudad(ciudad: str, search: str, limit: int = 20):
         raise RuntimeError(f"No hay scrapers configurados para la ciudad '{ciudad}'")
 
     async def gather_selected():
-        tasks = []
-        sync_results = []
-
-        for proveedor in proveedores:
-            scraper = PROVEEDORES.get(proveedor)
-            if not scraper:
-                continue
-
-            if asyncio.iscoroutinefunction(scraper):
-                tasks.append(scraper(search, limit))
-            else:
-                try:
-                    sync_results.append(scraper(search, limit))
-                except Exception as e:
-                    print(f"Error en scraper {proveedor}: {e}")
+        listas, pendientes, fallidos = await gather_providers(
+            proveedores, search, limit, use_cache, allow_stale, deadline_ms
+        )
+        return combinar(listas, limit, orden, agrupar), pendientes, fallidos
+
+    return run_sync(gather_selected())
+
+
+async def stream_providers(proveedores, search: str, provider_limit: int, limit: int,
+                           use_cache: bool = True, allow_stale: bool = True):
+    """
+    Consulta los proveedores en paralelo y emite un registro por cada uno apenas
+    termina, sin esperar al más lento. Al final emite un resumen con el estado
+    de cada proveedor.
+
+    Registros:
+        {"type": "provider", "provider": str, "elapsed_ms": int, "items": [...]}
+        {"type": "summary", "query": str, "total": int, "elapsed_ms": int, "providers": {...}}
+    """
+    start_time = time.monotonic()
+    tasks = {}
+    for proveedor in proveedores:
+        scraper = PROVEEDORES.get(proveedor)
+        if not scraper:
+            continue
+        task = asyncio.ensure_future(
+            run_provider(proveedor, scraper, search, provider_limit, use_cache, allow_stale)
+        )
+        tasks[task] = proveedor
+
+    summary = {}
+    total = 0
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                proveedor = tasks[task]
+                elapsed_ms = int((time.monotonic() - start_time) * 1000)
+                if task.exception() is not None:
+                    print(f"Error en scraper {proveedor}: {task.exception()}")
+                    status = "circuit_open" if isinstance(task.exception(), CircuitOpenError) else "error"
+                    summary[proveedor] = {"status": status, "count": 0, "elapsed_ms": elapsed_ms}
+                    continue
+
+                items = task.result() if isinstance(task.result(), list) else []
+                items = items[: max(limit - total, 0)]
+                total += len(items)
+                summary[proveedor] = {"status": "ok", "count": len(items), "elapsed_ms": elapsed_ms}
+                yield {"type": "provider", "provider": proveedor, "elapsed_ms": elapsed_ms, "items": items}
+    finally:
+        # si el cliente se desconecta, los scrapes pendientes siguen y llenan la cache
+        for task in pending:
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    yield {
+        "type": "summary",
+        "query": search,
+        "total": total,
+        "elapsed_ms": int((time.monotonic() - start_time) * 1000),
+        "providers": summary,
+    }
+
+
+def stream_all_products(search: str, limit: int = 50, use_cache: bool = True, allow_stale: bool = True):
+    search = search.lower()
+    return iter_sync(stream_providers(list(PROVEEDORES), search, 7, limit, use_cache, allow_stale))
 
-        async_results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        all_items = []
-        for sublist in async_results + sync_results:
-            if isinstance(sublist, list):
-                all_items.extend(sublist)
+def stream_products_by_ciudad(ciudad: str, search: str, limit: int = 20, use_cache: bool = True, allow_stale: bool = True):
+    ciudad = ciudad.lower()
+    search = search.lower()
 
-        return all_items[:limit]
+    proveedores = CIUDAD_PROVEEDORES.get(ciudad, [])
+    if not proveedores:
+        raise RuntimeError(f"No hay scrapers configurados para la ciudad '{ciudad}'")
 
-    return asyncio.run(gather_selected())
+    return iter_sync(stream_providers(proveedores, search, limit, limit, use_cache, allow_stale))
@@ -1,12 +1,18 @@
 from flask import Blueprint, jsonify, request
 from app.controllers.controllerConsumerProduct import fetch_all_products, fetch_products_proveedor
+from app.services.metodosGenericos import CRITERIOS_ORDEN
+from app.services.jsonResponse import compress_response, json_response
 
 consumerProducts = Blueprint('consumerProducts', __name__, url_prefix='/consumerProducts')
 
+# Compresión gzip/brotli según el Accept-Encoding del cliente
+consumerProducts.after_request(compress_response)
+
 @consumerProducts.route('/search', methods=['GET'])
 def search_consumerProducts():
     search = request.args.get('search')
     limit = int(request.args.get('limit', 30))
+    use_cache = request.args.get('nocache', '0').lower() not in ('1', 'true')
 
     if not search:
         return jsonify({"error": "Parámetro 'search' es requerido"}), 400
@@ -14,8 +20,13 @@ def search_consumerProducts():
     if not (1 <= limit <= 100):
         return jsonify({"error": "El parámetro 'limit' debe estar entre 1 y 100"}), 400
 
-    productos = fetch_all_products(search, limit)
-    return jsonify({
+    agrupar = request.args.get('group', '0').lower() in ('1', 'true')
+    orden = request.args.get('sort', 'relevance')
+    if orden not in CRITERIOS_ORDEN:
+        return jsonify({"error": f"El parámetro 'sort' debe ser uno de: {', '.join(CRITERIOS_ORDEN)}"}), 400
+
+    productos = fetch_all_products(search, limit, use_cache, orden=orden, agrupar=agrupar)
+    return json_response({
         "query": search,
         "total": len(productos),
         "items": productos
@@ -25,6 +36,7 @@ def search_consumerProducts():
 def search_for_proveedor(proveedor):
     search = request.args.get('search')
     limit = int(request.args.get('limit', 20))
+    use_cache = request.args.get('nocache', '0').lower() not in ('1', 'true')
 
     proveedores_validos = {"carrefour", "laanonima", "masonline"}
     # print(proveedor)
@@ -37,8 +49,8 @@ def search_for_proveedor(proveedor):
     if not (1 <= limit <= 100):
         return jsonify({"error": "El parámetro 'limit' debe estar entre 1 y 100"}), 400
 
-    productos = fetch_products_proveedor(proveedor.lower(), search, limit)
-    return jsonify({
+    productos = fetch_products_proveedor(proveedor.lower(), search, limit, use_cache)
+    return json_response({
         "query": search,
         "total": len(productos),
         "items": productos
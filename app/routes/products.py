@@ -1,8 +1,19 @@
-from flask import Blueprint, jsonify, request
-from app.controllers.controllerProduct import fetch_all_products, fetch_products_proveedor, fetch_products_by_ciudad
+from flask import Blueprint, Response, jsonify, request
+from app.services.metodosGenericos import CRITERIOS_ORDEN
+from app.services.jsonResponse import compress_response, encode, json_response
+from app.controllers.controllerProduct import (
+    fetch_all_products,
+    fetch_products_proveedor,
+    fetch_products_by_ciudad,
+    stream_all_products,
+    stream_products_by_ciudad,
+)
 
 products = Blueprint('products', __name__, url_prefix='/products')
 
+# Compresión gzip/brotli según el Accept-Encoding del cliente
+products.after_request(compress_response)
+
 # Mapeo de ciudades a proveedores disponibles
 CIUDAD_PROVEEDORES = {
     "comodoro": ["montessi", "forte", "neomat", "sagosa"],
@@ -13,6 +24,7 @@ CIUDAD_PROVEEDORES = {
 def search_products():
     search = request.args.get('search')
     limit = int(request.args.get('limit', 30))
+    use_cache = request.args.get('nocache', '0').lower() not in ('1', 'true')
 
     if not search:
         return jsonify({"error": "Parámetro 'search' es requerido"}), 400
@@ -20,17 +32,44 @@ def search_products():
     if not (1 <= limit <= 100):
         return jsonify({"error": "El parámetro 'limit' debe estar entre 1 y 100"}), 400
 
-    productos = fetch_all_products(search, limit)
-    return jsonify({
+    deadline_ms, error = parse_deadline()
+    if error:
+        return jsonify({"error": error}), 400
+
+    agrupar = request.args.get('group', '0').lower() in ('1', 'true')
+    orden = request.args.get('sort', 'relevance')
+    if orden not in CRITERIOS_ORDEN:
+        return jsonify({"error": f"El parámetro 'sort' debe ser uno de: {', '.join(CRITERIOS_ORDEN)}"}), 400
+
+    productos, pendientes, fallidos = fetch_all_products(search, limit, use_cache, deadline_ms=deadline_ms, orden=orden, agrupar=agrupar)
+    return json_response({
         "query": search,
         "total": len(productos),
-        "items": productos
+        "items": productos,
+        **partial_fields(deadline_ms, pendientes, fallidos),
     })
 
+@products.route('/search/stream', methods=['GET'])
+def stream_search_products():
+    """Igual que /search pero emite NDJSON: una línea por proveedor apenas responde y un resumen final."""
+    search = request.args.get('search')
+    limit = int(request.args.get('limit', 30))
+    use_cache = request.args.get('nocache', '0').lower() not in ('1', 'true')
+
+    if not search:
+        return jsonify({"error": "Parámetro 'search' es requerido"}), 400
+
+    if not (1 <= limit <= 100):
+        return jsonify({"error": "El parámetro 'limit' debe estar entre 1 y 100"}), 400
+
+    registros = stream_all_products(search, limit, use_cache)
+    return Response(ndjson(registros), mimetype="application/x-ndjson")
+
 @products.route('/search/<proveedor>', methods=['GET'])
 def search_for_proveedor(proveedor):
     search = request.args.get('search')
     limit = int(request.args.get('limit', 20))
+    use_cache = request.args.get('nocache', '0').lower() not in ('1', 'true')
 
     proveedores_validos = {"easy", "montessi", "neomat", "forte", "meli","perren","sagosa","cfernandes"}
     # print(proveedor)
@@ -43,8 +82,8 @@ def search_for_proveedor(proveedor):
     if not (1 <= limit <= 100):
         return jsonify({"error": "El parámetro 'limit' debe estar entre 1 y 100"}), 400
 
-    productos = fetch_products_proveedor(proveedor.lower(), search, limit)
-    return jsonify({
+    productos = fetch_products_proveedor(proveedor.lower(), search, limit, use_cache)
+    return json_response({
         "query": search,
         "total": len(productos),
         "items": productos
@@ -54,6 +93,7 @@ def search_for_proveedor(proveedor):
 def search_for_city(ciudad):
     search = request.args.get('search')
     limit = int(request.args.get('limit', 50))
+    use_cache = request.args.get('nocache', '0').lower() not in ('1', 'true')
 
     # Validar ciudad
     ciudad = ciudad.lower()
@@ -67,15 +107,82 @@ def search_for_city(ciudad):
     if not (1 <= limit <= 100):
         return jsonify({"error": "El parámetro 'limit' debe estar entre 1 y 100"}), 400
 
+    deadline_ms, error = parse_deadline()
+    if error:
+        return jsonify({"error": error}), 400
+
+    agrupar = request.args.get('group', '0').lower() in ('1', 'true')
+    orden = request.args.get('sort', 'relevance')
+    if orden not in CRITERIOS_ORDEN:
+        return jsonify({"error": f"El parámetro 'sort' debe ser uno de: {', '.join(CRITERIOS_ORDEN)}"}), 400
+
     # Buscar productos en los proveedores de esa ciudad
     try:
-        productos = fetch_products_by_ciudad(ciudad, search, limit)
+        productos, pendientes, fallidos = fetch_products_by_ciudad(
+            ciudad, search, limit, use_cache, deadline_ms=deadline_ms, orden=orden, agrupar=agrupar
+        )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-    return jsonify({
+    return json_response({
         "query": search,
         "city": ciudad,
         "total": len(productos),
-        "items": productos
-    })
\ No newline at end of file
+        "items": productos,
+        **partial_fields(deadline_ms, pendientes, fallidos),
+    })
+
+@products.route('/city/<ciudad>/stream', methods=['GET'])
+def stream_search_for_city(ciudad):
+    """Igual que /city/<ciudad> pero emite NDJSON a medida que responde cada proveedor."""
+    search = request.args.get('search')
+    limit = int(request.args.get('limit', 50))
+    use_cache = request.args.get('nocache', '0').lower() not in ('1', 'true')
+
+    # Validar ciudad
+    ciudad = ciudad.lower()
+    if ciudad not in CIUDAD_PROVEEDORES:
+        return jsonify({"error": f"Ciudad '{ciudad}' no es válida"}), 400
+
+    # Validar parámetros
+    if not search:
+        return jsonify({"error": "Parámetro 'search' es requerido"}), 400
+
+    if not (1 <= limit <= 100):
+        return jsonify({"error": "El parámetro 'limit' debe estar entre 1 y 100"}), 400
+
+    try:
+        registros = stream_products_by_ciudad(ciudad, search, limit, use_cache)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    return Response(ndjson(registros), mimetype="application/x-ndjson")
+
+def parse_deadline():
+    """Lee `deadline_ms` (opcional). Devuelve `(deadline_ms, error)`."""
+    deadline_ms = request.args.get('deadline_ms')
+    if deadline_ms is None:
+        return None, None
+    try:
+        deadline_ms = int(deadline_ms)
+    except ValueError:
+        return None, "El parámetro 'deadline_ms' debe ser un entero"
+    if not (1 <= deadline_ms <= 60000):
+        return None, "El parámetro 'deadline_ms' debe estar entre 1 y 60000"
+    return deadline_ms, None
+
+def partial_fields(deadline_ms, pendientes, fallidos):
+    # con plazo, se informa qué proveedores no llegaron a tiempo (siguen llenando
+    # la cache); con o sin plazo, cuáles fallaron o tenían el circuito abierto
+    if deadline_ms is None and not fallidos:
+        return {}
+    campos = {"partial": bool(pendientes or fallidos)}
+    if deadline_ms is not None:
+        campos["pending"] = pendientes
+    campos["failed"] = fallidos
+    return campos
+
+def ndjson(registros):
+    # una línea JSON por registro; el cliente puede procesarlas a medida que llegan
+    for registro in registros:
+        yield encode(registro) + b"\n"
@@ -0,0 +1,105 @@
+import asyncio
+import atexit
+import logging
+import queue
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+_loop = None
+_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Devuelve el event loop de larga duración de la app, que corre en un hilo propio.
+
+    Todos los requests ejecutan sus corrutinas acá (ver `run_sync`), así que
+    comparten los clientes httpx, el pool de Chromium y las tareas en segundo
+    plano (refrescos de cache, etc.), que sobreviven al request que las lanzó.
+    """
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_loop.run_forever, name="background-loop", daemon=True
+            )
+            thread.start()
+            logger.info("[backgroundLoop] loop de fondo iniciado")
+        return _loop
+
+
+def submit(coro):
+    """Programa `coro` en el loop de fondo y devuelve un `concurrent.futures.Future`."""
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+
+
+def run_sync(coro, timeout=None):
+    """
+    Ejecuta `coro` en el loop compartido y bloquea el hilo actual (el del request
+    de Flask) hasta tener el resultado. Reemplaza a `asyncio.run` por request.
+    """
+    loop = get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync no puede llamarse desde el loop compartido; usar await")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+def iter_sync(agen):
+    """
+    Recorre un generador asíncrono en el loop compartido y entrega sus valores
+    al hilo actual como un iterador común (para respuestas en streaming de Flask).
+    Si el consumidor deja de iterar (el cliente se desconectó), se cancela.
+    """
+    items = queue.Queue()
+
+    async def pump():
+        try:
+            async for item in agen:
+                items.put(("item", item))
+        except Exception as e:
+            items.put(("error", e))
+        finally:
+            items.put(("done", None))
+
+    future = submit(pump())
+    try:
+        while True:
+            kind, value = items.get()
+            if kind == "done":
+                break
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        future.cancel()
+
+
+async def _shutdown():
+    from app.services.browserPool import close_browser_pool
+    from app.services.httpClient import aclose_clients
+
+    await close_browser_pool()
+    await aclose_clients()
+
+
+@atexit.register
+def _close_shared_resources():
+    # Cierra Chromium, las conexiones abiertas y el pool de parseo al apagar el proceso
+    if _loop is not None and not _loop.is_closed() and _loop.is_running():
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown(), _loop).result(10)
+        except Exception as e:
+            logger.warning(f"[backgroundLoop] Error cerrando recursos compartidos: {e}")
+    # si nadie importó parsePool no hay pool que cerrar; importarlo acá, ya
+    # apagando el intérprete, falla al registrar su propio atexit
+    parse_pool = sys.modules.get("app.services.parsePool")
+    if parse_pool is not None:
+        parse_pool.shutdown_parse_pool()
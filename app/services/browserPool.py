@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+import weakref
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+from app.services import resourcePolicy
+
+logger = logging.getLogger(__name__)
+
+# Configuración del pool (se puede ajustar por variables de entorno en cada deploy)
+BROWSER_CONFIG = {
+    "max_concurrency": int(os.getenv("BROWSER_MAX_CONCURRENCY", 4)),
+    "max_uses": int(os.getenv("BROWSER_MAX_USES", 50)),
+    "headless": os.getenv("BROWSER_HEADLESS", "1") == "1",
+}
+
+
+class BrowserPool:
+    """
+    Mantiene un Chromium abierto y entrega contextos aislados por búsqueda.
+
+    - `lease()` abre un contexto nuevo (cookies/cache propios) y devuelve una página.
+    - Un semáforo limita la cantidad de páginas abiertas en simultáneo.
+    - Después de `max_uses` préstamos el navegador se recicla: el actual se cierra
+      cuando terminan sus préstamos activos y el siguiente préstamo lanza uno nuevo.
+    """
+
+    def __init__(self, max_concurrency=4, max_uses=50, headless=True):
+        self.max_concurrency = max_concurrency
+        self.max_uses = max_uses
+        self.headless = headless
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._uses = 0
+        self._active = {}  # navegador -> préstamos activos
+        self._retired = set()
+
+    async def _acquire(self):
+        async with self._lock:
+            if self._browser is not None and (
+                self._uses >= self.max_uses or not self._browser.is_connected()
+            ):
+                browser = self._browser
+                self._retire(browser)
+                # sin préstamos activos no va a pasar por `_release`: se cierra ya
+                if self._active.get(browser, 0) == 0:
+                    self._active.pop(browser, None)
+                    self._retired.discard(browser)
+                    await self._close_browser(browser)
+
+            if self._browser is None:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                self._uses = 0
+                logger.info("[browserPool] Chromium lanzado")
+
+            self._uses += 1
+            self._active[self._browser] = self._active.get(self._browser, 0) + 1
+            return self._browser
+
+    def _retire(self, browser):
+        self._browser = None
+        self._retired.add(browser)
+
+    async def _release(self, browser):
+        async with self._lock:
+            self._active[browser] -= 1
+            if self._active[browser] == 0 and browser in self._retired:
+                del self._active[browser]
+                self._retired.discard(browser)
+                await self._close_browser(browser)
+
+    async def _close_browser(self, browser):
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning(f"[browserPool] Error cerrando Chromium: {e}")
+
+    @asynccontextmanager
+    async def lease(self, provider=None, **context_options):
+        """
+        Presta una página dentro de un contexto aislado. Las opciones se pasan
+        a `browser.new_context` (user_agent, locale, viewport, etc.). Con
+        `provider` se aplica su política de bloqueo de recursos (ver resourcePolicy).
+
+            async with pool.lease("easy", user_agent="...") as page:
+                await page.goto(url)
+        """
+        async with self._semaphore:
+            browser = await self._acquire()
+            context = None
+            try:
+                context = await browser.new_context(**context_options)
+                if provider is not None:
+                    await resourcePolicy.install(context, provider)
+                page = await context.new_page()
+                yield page
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception as e:
+                        logger.warning(f"[browserPool] Error cerrando contexto: {e}")
+                await self._release(browser)
+
+    def stats(self):
+        return {
+            "browser_open": self._browser is not None,
+            "uses": self._uses,
+            "max_uses": self.max_uses,
+            "max_concurrency": self.max_concurrency,
+            "active_leases": sum(self._active.values()),
+        }
+
+    async def aclose(self):
+        async with self._lock:
+            browsers = set(self._active) | self._retired
+            if self._browser is not None:
+                browsers.add(self._browser)
+            for browser in browsers:
+                await self._close_browser(browser)
+            self._browser = None
+            self._active.clear()
+            self._retired.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+# Un pool por event loop: los objetos de Playwright quedan atados al loop que los creó
+_pools = weakref.WeakKeyDictionary()
+
+
+def get_browser_pool() -> BrowserPool:
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = BrowserPool(**BROWSER_CONFIG)
+        _pools[loop] = pool
+    return pool
+
+
+def lease(provider=None, **context_options):
+    """Atajo para `get_browser_pool().lease(...)`."""
+    return get_browser_pool().lease(provider, **context_options)
+
+
+async def close_browser_pool():
+    """Cierra el pool del loop actual, si existe."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.aclose()
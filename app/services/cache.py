@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Ventana "fresca" en segundos por proveedor: dentro de ella el resultado se
+# sirve tal cual. Los que usan Playwright son caros de consultar, así que se
+# guardan más tiempo.
+PROVIDER_TTL = {
+    "montessi": 300,
+    "forte": 300,
+    "neomat": 300,
+    "sagosa": 300,
+    "cfernandes": 300,
+    "perren": 300,
+    "meli": 120,
+    "easy": 900,
+    "carrefour": 600,
+    "laanonima": 900,
+    "masonline": 600,
+}
+
+# Edad máxima en segundos ("max-stale"): pasada la ventana fresca y hasta este
+# límite, el resultado todavía puede servirse mientras se refresca en segundo plano.
+PROVIDER_MAX_STALE = {
+    "montessi": 1800,
+    "forte": 1800,
+    "neomat": 1800,
+    "sagosa": 1800,
+    "cfernandes": 1800,
+    "perren": 1800,
+    "meli": 600,
+    "easy": 3600,
+    "carrefour": 3600,
+    "laanonima": 3600,
+    "masonline": 3600,
+}
+
+
+def normalize_query(search: str) -> str:
+    """Normaliza la búsqueda para que 'Cemento  ' y 'cemento' compartan entrada."""
+    return " ".join((search or "").lower().split())
+
+
+class ResultCache:
+    """
+    Cache en memoria de resultados por (proveedor, búsqueda normalizada).
+
+    - Cada proveedor tiene su TTL (`PROVIDER_TTL`, o `default_ttl`) y una edad
+      máxima (`PROVIDER_MAX_STALE`) hasta la que la entrada se conserva como vieja.
+    - La memoria está acotada por cantidad de entradas y de productos guardados;
+      al superarse se descartan las entradas usadas hace más tiempo (LRU).
+    - Una entrada guardada con `limit=30` sirve también a pedidos con `limit<=30`.
+    """
+
+    def __init__(self, max_entries=512, max_items=20000, default_ttl=300, ttls=None,
+                 default_max_stale=1800, max_stale=None):
+        self.max_entries = max_entries
+        self.max_items = max_items
+        self.default_ttl = default_ttl
+        self.default_max_stale = default_max_stale
+        self.ttls = dict(PROVIDER_TTL if ttls is None else ttls)
+        self.max_stale = dict(PROVIDER_MAX_STALE if max_stale is None else max_stale)
+        # (proveedor, query) -> (fresco_hasta, viejo_hasta, limit, items)
+        self._entries = OrderedDict()
+        self._items = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, provider: str) -> float:
+        return self.ttls.get(provider, self.default_ttl)
+
+    def max_stale_for(self, provider: str) -> float:
+        return max(self.max_stale.get(provider, self.default_max_stale), self.ttl_for(provider))
+
+    def lookup(self, provider: str, search: str, limit: int, allow_stale: bool = True):
+        """
+        Devuelve `(items, fresco)` o None. Con `allow_stale` también devuelve
+        entradas vencidas que no superaron su edad máxima, con `fresco=False`.
+        """
+        key = (provider, normalize_query(search))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                fresh_until, stale_until, cached_limit, items = entry
+                now = time.monotonic()
+                if stale_until <= now:
+                    self._remove(key)
+                # sirve si se pidió lo mismo o menos, o si el proveedor no tenía más
+                elif limit <= cached_limit or len(items) < cached_limit:
+                    fresh = now < fresh_until
+                    if fresh or allow_stale:
+                        self._entries.move_to_end(key)
+                        if fresh:
+                            self.hits += 1
+                        else:
+                            self.stale_hits += 1
+                        return items[:limit], fresh
+            self.misses += 1
+            return None
+
+    def cached_limit(self, provider: str, search: str):
+        """`limit` con el que se guardó la entrada vigente de la búsqueda, o None."""
+        key = (provider, normalize_query(search))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            return entry[2]
+
+    def get(self, provider: str, search: str, limit: int):
+        """Devuelve solo resultados frescos, o None."""
+        hit = self.lookup(provider, search, limit, allow_stale=False)
+        return hit[0] if hit else None
+
+    def set(self, provider: str, search: str, limit: int, items, age: float = 0):
+        """
+        Guarda `items`. `age` indica cuántos segundos tiene ya el resultado
+        (por ejemplo si viene del almacenamiento en disco). Una entrada vigente
+        guardada con un `limit` mayor no se reemplaza por una más chica.
+        """
+        # No se guardan resultados vacíos: suelen ser errores o timeouts del scraper
+        if not items:
+            return
+        key = (provider, normalize_query(search))
+        items = list(items)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > time.monotonic() and entry[2] > limit:
+                    return
+                self._remove(key)
+            now = time.monotonic() - age
+            self._entries[key] = (
+                now + self.ttl_for(provider),
+                now + self.max_stale_for(provider),
+                limit,
+                items,
+            )
+            self._items += len(items)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._items > self.max_items
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        *_, items = self._entries.pop(key)
+        self._items -= len(items)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._items = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "items": self._items,
+                "max_entries": self.max_entries,
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.stale_hits) / total, 3) if total else 0.0,
+            }
+
+
+# Cache compartida por todo el proceso
+result_cache = ResultCache(
+    max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", 512)),
+    max_items=int(os.getenv("RESULT_CACHE_MAX_ITEMS", 20000)),
+)
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+
+# Configuración de los circuit breakers (ajustable por variables de entorno)
+BREAKER_CONFIG = {
+    "failure_threshold": int(os.getenv("BREAKER_FAILURES", 3)),
+    "reset_timeout": float(os.getenv("BREAKER_RESET_SECONDS", 30)),
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """El proveedor tiene el circuito abierto y no se lo consulta."""
+
+
+class CircuitBreakers:
+    """
+    Un circuit breaker por proveedor.
+
+    - closed: se consulta normalmente; `failure_threshold` fallas o timeouts
+      seguidos abren el circuito.
+    - open: se rechaza al instante (CircuitOpenError) durante `reset_timeout` segundos.
+    - half_open: pasado ese tiempo se deja pasar una sola consulta de prueba;
+      si sale bien el circuito se cierra y si falla vuelve a abrirse.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, provider):
+        circuit = self._circuits.get(provider)
+        if circuit is None:
+            circuit = self._circuits[provider] = {
+                "state": CLOSED,
+                "failures": 0,
+                "opened_at": None,
+                "probing": False,
+                "rejected": 0,
+            }
+        return circuit
+
+    def acquire(self, provider: str):
+        """Autoriza una consulta al proveedor o lanza CircuitOpenError."""
+        with self._lock:
+            circuit = self._circuit(provider)
+            if circuit["state"] == CLOSED:
+                return
+            if circuit["state"] == OPEN and time.monotonic() - circuit["opened_at"] >= self.reset_timeout:
+                circuit["state"] = HALF_OPEN
+            if circuit["state"] == HALF_OPEN and not circuit["probing"]:
+                circuit["probing"] = True
+                return
+            circuit["rejected"] += 1
+        raise CircuitOpenError(f"{provider}: circuito abierto, no se consulta")
+
+    def record_success(self, provider: str):
+        with self._lock:
+            circuit = self._circuit(provider)
+            circuit.update(state=CLOSED, failures=0, opened_at=None, probing=False)
+
+    def record_failure(self, provider: str):
+        with self._lock:
+            circuit = self._circuit(provider)
+            circuit["failures"] += 1
+            if circuit["state"] == HALF_OPEN or circuit["failures"] >= self.failure_threshold:
+                circuit.update(state=OPEN, opened_at=time.monotonic(), probing=False)
+
+    def release(self, provider: str):
+        """Libera la prueba en curso sin resultado (por ejemplo si se canceló)."""
+        with self._lock:
+            circuit = self._circuit(provider)
+            if circuit["probing"]:
+                circuit["probing"] = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                provider: {
+                    "state": circuit["state"],
+                    "failures": circuit["failures"],
+                    "rejected": circuit["rejected"],
+                }
+                for provider, circuit in self._circuits.items()
+            }
+
+
+circuit_breakers = CircuitBreakers(**BREAKER_CONFIG)
@@ -0,0 +1,160 @@
+import re
+import unicodedata
+import zlib
+
+# Agrupado de productos iguales entre proveedores (ej. "Cemento Loma Negra 50kg"
+# en Sagosa y en Montessi). Se usa MinHash con LSH por bandas: cada producto se
+# compara solo con los que caen en alguno de sus mismos baldes, en lugar de
+# todos contra todos. Con nombres variados los baldes son chicos y el costo es
+# casi lineal; en el peor caso (muchos nombres casi iguales) sigue siendo cuadrático.
+NUM_HASHES = 24
+BANDS = 12  # 12 bandas de 2 hashes
+SIMILARITY_THRESHOLD = 0.7
+
+# Marcas de relleno que ponen los scrapers cuando la página no trae la marca
+PLACEHOLDER_BRANDS = {"marca no encontrada", "sin marca"}
+
+# Palabras que no ayudan a distinguir productos
+STOPWORDS = {"de", "del", "la", "el", "los", "las", "x", "por", "para", "con", "en", "y", "a", "un", "una"}
+
+# Unidades: "50 kg", "50 kgs", "50kilos" → "50kg"
+_UNITS = {
+    "kg": "kg", "kgs": "kg", "kilo": "kg", "kilos": "kg",
+    "g": "g", "gr": "g", "grs": "g", "gramos": "g",
+    "l": "l", "lt": "l", "lts": "l", "litro": "l", "litros": "l",
+    "ml": "ml", "cc": "ml",
+    "m": "m", "mt": "m", "mts": "m", "metro": "m", "metros": "m",
+    "cm": "cm", "mm": "mm",
+}
+_QUANTITY_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*(" + "|".join(sorted(_UNITS, key=len, reverse=True)) + r")\b")
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)?")
+
+# Semillas fijas para que las firmas sean iguales entre procesos
+_SEEDS = [zlib.crc32(f"minhash-{i}".encode()) for i in range(NUM_HASHES)]
+
+
+def normalize_text(text) -> str:
+    """Minúsculas, sin acentos y con las cantidades unidas a su unidad."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _QUANTITY_RE.sub(lambda m: m.group(1).replace(",", ".") + _UNITS[m.group(2)], text)
+
+
+def tokens(name) -> frozenset:
+    return frozenset(t for t in _TOKEN_RE.findall(normalize_text(name)) if t not in STOPWORDS)
+
+
+def _numeric(token_set):
+    # las medidas tienen que coincidir: "cemento 25kg" no es "cemento 50kg"
+    return frozenset(t for t in token_set if t[0].isdigit())
+
+
+def minhash(token_set):
+    encoded = [t.encode() for t in token_set]
+    return tuple(min(zlib.crc32(t, seed) for t in encoded) for seed in _SEEDS)
+
+
+def _brand(value) -> str:
+    brand = normalize_text(value).strip()
+    return "" if brand in PLACEHOLDER_BRANDS else brand
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def _price(item):
+    value = item.price
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _compatible(a, b):
+    brand_a, tokens_a = a
+    brand_b, tokens_b = b
+    if brand_a and brand_b and brand_a != brand_b:
+        return False
+    if _numeric(tokens_a) != _numeric(tokens_b):
+        return False
+    return _jaccard(tokens_a, tokens_b) >= SIMILARITY_THRESHOLD
+
+
+def cluster_products(items):
+    """
+    Agrupa los productos probablemente iguales de distintos proveedores y
+    devuelve un representante por grupo (el más barato), en el orden en que
+    aparece el primer producto de cada grupo. Un grupo nunca junta dos productos
+    del mismo proveedor ni de marcas distintas. El representante suma:
+
+        offers:       cantidad de ofertas del grupo
+        alternatives: [{"source", "price", "link"}] de las otras ofertas
+    """
+    parent = list(range(len(items)))
+    # marca y proveedores de cada grupo, guardados en su raíz: la unión es
+    # transitiva, así que no alcanza con comparar los dos productos
+    group_brand = {}
+    group_sources = {}
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j:
+            return
+        brand_i, brand_j = group_brand[root_i], group_brand[root_j]
+        if brand_i and brand_j and brand_i != brand_j:
+            return
+        if group_sources[root_i] & group_sources[root_j]:
+            return
+        parent[root_i] = root_j
+        group_brand[root_j] = brand_j or brand_i
+        group_sources[root_j] |= group_sources.pop(root_i)
+        del group_brand[root_i]
+
+    features = []
+    buckets = {}
+    rows = NUM_HASHES // BANDS
+    for i, item in enumerate(items):
+        token_set = tokens(item.name)
+        features.append((_brand(item.brand), token_set))
+        group_brand[i] = features[i][0]
+        group_sources[i] = {item.source} if item.source else set()
+        if not token_set:
+            continue
+        signature = minhash(token_set)
+        for band in range(BANDS):
+            key = (band, signature[band * rows:(band + 1) * rows])
+            # se compara con todos los del balde, no solo con el primero
+            bucket = buckets.setdefault(key, [])
+            for j in bucket:
+                if find(i) != find(j) and _compatible(features[i], features[j]):
+                    union(i, j)
+            bucket.append(i)
+
+    # recorriendo en orden, los grupos quedan según su primer producto
+    groups = {}
+    for i in range(len(items)):
+        groups.setdefault(find(i), []).append(i)
+
+    result = []
+    for members in groups.values():
+        priced = [i for i in members if _price(items[i]) is not None]
+        best = min(priced, key=lambda i: _price(items[i])) if priced else members[0]
+        alternatives = [
+            {
+                "source": items[i].source,
+                "price": _price(items[i]),
+                "link": items[i].link,
+            }
+            for i in members
+            if i != best
+        ]
+        result.append(items[best].replace(offers=len(members), alternatives=alternatives))
+    return result
@@ -1,15 +1,22 @@
 import asyncio
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
 
 def with_timeout_and_log(timeout=20):
     def decorator(coro_func):
+        # functools.wraps deja la función original en `__wrapped__`: run_provider
+        # la llama directo (con timeout adaptativo) para ver los errores reales.
+        # Por eso los scrapers dejan pasar los errores de conexión: acá se
+        # convierten en [] y run_provider los cuenta como fallas del proveedor
+        @functools.wraps(coro_func)
         async def wrapper(*args, **kwargs):
             try:
                 return await asyncio.wait_for(coro_func(*args, **kwargs), timeout=timeout)
             except Exception as e:
                 logger.warning(f"[fetch_all_products] Error en {coro_func.__name__}: {e}")
                 return []
+        wrapper.timeout = timeout
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import threading
+
+# Proveedores en los que se duplica la petición cuando tarda más que su p90.
+# Es opcional (vacío por defecto) y pensado para los de httpx, por ejemplo
+# HEDGE_PROVIDERS=montessi,forte,neomat,sagosa,cfernandes,perren; los de
+# Playwright no conviene: cada intento ocupa un navegador
+HEDGE_PROVIDERS = set(filter(None, os.getenv("HEDGE_PROVIDERS", "").split(",")))
+
+# Presupuesto global: cada consulta suma `ratio` fichas y cada petición
+# duplicada gasta una, así que a la larga se duplica como mucho ese porcentaje
+HEDGE_CONFIG = {
+    "percentile": float(os.getenv("HEDGE_PERCENTILE", 0.90)),
+    "ratio": float(os.getenv("HEDGE_BUDGET_RATIO", 0.1)),
+    "max_tokens": float(os.getenv("HEDGE_BUDGET_MAX", 10)),
+}
+
+
+class HedgeBudget:
+    def __init__(self, percentile=0.90, ratio=0.1, max_tokens=10):
+        self.percentile = percentile
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._denied = 0
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self._denied += 1
+                return False
+            self._tokens -= 1
+            self._hedged += 1
+            return True
+
+    def record_win(self):
+        with self._lock:
+            self._hedge_wins += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "tokens": round(self._tokens, 2),
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+                "denied": self._denied,
+            }
+
+
+hedge_budget = HedgeBudget(**HEDGE_CONFIG)
+
+
+def hedging_enabled(provider: str) -> bool:
+    return provider in HEDGE_PROVIDERS
+
+
+async def hedged(attempt, delay: float, budget: HedgeBudget = hedge_budget):
+    """
+    Ejecuta `attempt()` y, si no terminó en `delay` segundos y el presupuesto lo
+    permite, lanza un segundo intento idéntico. Devuelve el primero que termine
+    bien; el otro se cancela. Si los dos fallan se propaga el último error.
+    """
+    budget.deposit()
+    first = asyncio.ensure_future(attempt())
+    tasks = {first}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done or not budget.try_spend():
+            return await first
+
+        second = asyncio.ensure_future(attempt())
+        tasks.add(second)
+        pending = set(tasks)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        budget.record_win()
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,47 @@
+import importlib.util
+import os
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml es bastante más rápido que html.parser, pero es opcional (extra
+# `speedups` del pyproject): si no está instalado se usa el parser de la
+# librería estándar.
+_LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
+
+DEFAULT_BACKEND = os.getenv("HTML_PARSER", "lxml")
+
+# Backend por proveedor, solo para los que no usan DEFAULT_BACKEND
+# (ej. "meli": "html.parser" si su HTML no se lleva bien con lxml)
+PARSER_BACKENDS = {}
+
+
+def backend_for(provider: str) -> str:
+    backend = PARSER_BACKENDS.get(provider, DEFAULT_BACKEND)
+    if backend == "lxml" and not _LXML_AVAILABLE:
+        return "html.parser"
+    return backend
+
+
+def only(name=None, **attrs) -> SoupStrainer:
+    """
+    Atajo para armar el filtro del subárbol a parsear, por ejemplo
+    `only("div", class_="js-item-product")`.
+    """
+    if "class_" in attrs:
+        # Durante el parseo el atributo class llega como texto ("js-item-product col"),
+        # así que se busca la clase como palabra completa dentro de ese texto
+        css_class = attrs.pop("class_")
+        attrs["class"] = re.compile(rf"(^|\s){re.escape(css_class)}(\s|$)")
+    return SoupStrainer(name, attrs)
+
+
+def make_soup(html, provider: str, parse_only: SoupStrainer = None) -> BeautifulSoup:
+    """
+    Construye el árbol con el backend configurado para `provider`.
+
+    Con `parse_only` solo se construyen los elementos que coinciden (y todo su
+    contenido), en lugar del árbol de la página completa: el resto del HTML se
+    recorre pero no genera nodos.
+    """
+    return BeautifulSoup(html, backend_for(provider), parse_only=parse_only)
@@ -0,0 +1,97 @@
+import asyncio
+import importlib.util
+import logging
+import os
+import weakref
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Configuración del pool (se puede ajustar por variables de entorno en cada deploy)
+HTTP_CONFIG = {
+    "http2": os.getenv("HTTPX_HTTP2", "0") == "1",
+    "max_connections": int(os.getenv("HTTPX_MAX_CONNECTIONS", 20)),
+    "max_keepalive_connections": int(os.getenv("HTTPX_MAX_KEEPALIVE", 10)),
+    "keepalive_expiry": float(os.getenv("HTTPX_KEEPALIVE_EXPIRY", 30)),
+    "timeout": float(os.getenv("HTTPX_TIMEOUT", 15)),
+}
+
+# Un cliente por host y por event loop: las conexiones de httpx quedan atadas
+# al loop que las creó, así que no se pueden compartir entre loops distintos.
+_clients = weakref.WeakKeyDictionary()
+
+
+def configure_http(**options):
+    """
+    Actualiza la configuración del pool. Solo afecta a los clientes creados
+    después de la llamada.
+    """
+    unknown = set(options) - set(HTTP_CONFIG)
+    if unknown:
+        raise ValueError(f"Opciones de HTTP desconocidas: {', '.join(sorted(unknown))}")
+    HTTP_CONFIG.update(options)
+
+
+def _http2_enabled():
+    # HTTP/2 requiere el paquete opcional `h2`
+    if not HTTP_CONFIG["http2"]:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("[httpClient] HTTP/2 pedido pero 'h2' no está instalado, se usa HTTP/1.1")
+        return False
+    return True
+
+
+class _FixedCookiePolicy(DefaultCookiePolicy):
+    """No guarda las cookies que mandan las respuestas: el cliente solo envía las fijas."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+def _new_client(cookies=None):
+    limits = httpx.Limits(
+        max_connections=HTTP_CONFIG["max_connections"],
+        max_keepalive_connections=HTTP_CONFIG["max_keepalive_connections"],
+        keepalive_expiry=HTTP_CONFIG["keepalive_expiry"],
+    )
+    client = httpx.AsyncClient(
+        http2=_http2_enabled(),
+        limits=limits,
+        timeout=HTTP_CONFIG["timeout"],
+        cookies=cookies,
+    )
+    if cookies is not None:
+        client.cookies.jar.set_policy(_FixedCookiePolicy())
+    return client
+
+
+def get_client(url: str, cookies: dict = None) -> httpx.AsyncClient:
+    """
+    Devuelve el cliente compartido para el host de `url`, creándolo si hace falta.
+    El cliente mantiene las conexiones vivas entre búsquedas, evitando repetir
+    DNS + TCP + TLS en cada request al mismo proveedor.
+
+    Con `cookies` se usa un cliente aparte que manda siempre esas cookies y no
+    guarda las que setean las respuestas, así no pasan de una búsqueda a otra.
+    """
+    loop = asyncio.get_running_loop()
+    host = urlsplit(url).netloc
+    key = host if cookies is None else (host, tuple(sorted(cookies.items())))
+    by_host = _clients.setdefault(loop, {})
+
+    client = by_host.get(key)
+    if client is None or client.is_closed:
+        client = _new_client(cookies)
+        by_host[key] = client
+    return client
+
+
+async def aclose_clients():
+    """Cierra los clientes del loop actual (por ejemplo al apagar la app)."""
+    by_host = _clients.pop(asyncio.get_running_loop(), {})
+    for client in by_host.values():
+        await client.aclose()
@@ -0,0 +1,150 @@
+import html
+import json
+import os
+import re
+
+from app.services.product import Product
+
+# Proveedores que intentan primero la extracción desde el JSON embebido en la
+# página (sin armar el árbol HTML). Si el JSON no está, usan el camino por DOM.
+JSON_FIRST_PROVIDERS = set(
+    os.getenv("JSON_FIRST_PROVIDERS", "forte,montessi,neomat,easy").split(",")
+)
+
+_SCRIPT_RE = re.compile(rb"<script\b([^>]*)>(.*?)</script>", re.S | re.I)
+_ATTR_RE = r"""\b{name}\s*=\s*(?:"([^"]*)"|'([^']*)')"""
+
+
+def json_first(provider: str) -> bool:
+    return provider in JSON_FIRST_PROVIDERS
+
+
+def _as_bytes(raw):
+    return raw.encode("utf-8") if isinstance(raw, str) else raw
+
+
+def _attr(tag: bytes, name: str):
+    match = re.search(_ATTR_RE.format(name=re.escape(name)).encode(), tag, re.I)
+    if not match:
+        return None
+    value = match.group(1) if match.group(1) is not None else match.group(2)
+    return html.unescape(value.decode("utf-8", "replace"))
+
+
+def iter_attr_json(raw, attr: str):
+    """Decodifica como JSON cada valor del atributo `attr` (ej. `data-variants`)."""
+    pattern = re.compile(_ATTR_RE.format(name=re.escape(attr)).encode(), re.I)
+    for match in pattern.finditer(_as_bytes(raw)):
+        value = match.group(1) if match.group(1) is not None else match.group(2)
+        try:
+            yield json.loads(html.unescape(value.decode("utf-8", "replace")))
+        except json.JSONDecodeError:
+            yield None
+
+
+def iter_ld_json(raw, data_component: str = None):
+    """
+    Devuelve el contenido de cada `<script type="application/ld+json">`,
+    opcionalmente solo los que tienen ese `data-component`.
+    """
+    for attrs, body in _SCRIPT_RE.findall(_as_bytes(raw)):
+        if b"application/ld+json" not in attrs:
+            continue
+        if data_component and _attr(attrs, "data-component") != data_component:
+            continue
+        try:
+            yield json.loads(body)
+        except json.JSONDecodeError:
+            yield None
+
+
+def find_script_json(raw, marker: str):
+    """Devuelve el JSON del primer `<script>` cuyo contenido incluye `marker`."""
+    marker = marker.encode()
+    for _, body in _SCRIPT_RE.findall(_as_bytes(raw)):
+        if marker in body:
+            try:
+                return json.loads(body.strip())
+            except json.JSONDecodeError:
+                return None
+    return None
+
+
+def iter_tag_attr(raw, tag: str, css_class: str, attr: str):
+    """
+    Devuelve, en orden de aparición, el atributo `attr` de cada etiqueta `tag`
+    que tenga la clase `css_class` (None si la etiqueta no lo tiene).
+    """
+    tag_re = re.compile(rb"<" + tag.encode() + rb"\b[^>]*>", re.I)
+    for match in tag_re.finditer(_as_bytes(raw)):
+        classes = _attr(match.group(0), "class")
+        if classes and css_class in classes.split():
+            yield _attr(match.group(0), attr)
+
+
+def tiendanube_items(raw):
+    """
+    Empareja, producto por producto, el `data-variants` y el bloque ld+json
+    `structured-data.item` de un listado de Tiendanube. Devuelve None si la
+    página no los trae (o no coinciden), para usar el camino por DOM.
+    """
+    variants = list(iter_attr_json(raw, "data-variants"))
+    structured = list(iter_ld_json(raw, "structured-data.item"))
+    if not variants or len(variants) != len(structured):
+        return None
+    if any(not v or d is None for v, d in zip(variants, structured)):
+        return None
+    return list(zip(variants, structured))
+
+
+def first_url(value):
+    """Los campos `image`/`url` de ld+json pueden venir como texto, lista u objeto."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("url") or value.get("contentUrl")
+    return value
+
+
+def _brand_name(value):
+    # `brand` de ld+json puede venir como objeto ({"name": ...}) o como texto
+    if isinstance(value, dict):
+        value = value.get("name")
+    return value or "Marca no encontrada"
+
+
+def tiendanube_products(raw, limit, source, logo):
+    """
+    Arma los productos de un listado de Tiendanube desde `data-variants` y
+    ld+json (ver `tiendanube_items`). Devuelve None si la página no los trae o
+    vienen con una forma inesperada, para usar el camino por DOM.
+    """
+    items = tiendanube_items(raw)
+    if items is None:
+        return None
+
+    products = []
+    try:
+        for variants, data in items[:limit]:
+            variant = variants[0]  # Suponemos que el primer elemento contiene los datos relevantes
+            offers = data.get("offers") or {}
+            if isinstance(offers, list):
+                offers = offers[0] if offers else {}
+            products.append(Product(
+                id=variant.get("product_id"),
+                name=data.get("name"),
+                price_text=variant.get("price_short"),
+                price=variant.get("price_number"),
+                image=first_url(data.get("image")) or logo,
+                link=offers.get("url") or first_url(data.get("url")),
+                stock=variant.get("stock"),
+                source=source,
+                brand=_brand_name(data.get("brand")),
+                category=None,
+                discount=None,
+                logo=logo,
+            ))
+    except (AttributeError, KeyError, IndexError, TypeError) as e:
+        print("JSON embebido inesperado, se usa el DOM:", e)
+        return None
+    return products
@@ -0,0 +1,102 @@
+import gzip
+import hashlib
+import json
+
+from flask import Response, request
+
+from app.services.product import SCHEMA_VERSION, Product
+
+# orjson es bastante más rápido que el json de la librería estándar, pero es
+# opcional (extra `speedups`): si no está instalado se usa json con salida compacta
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# brotli también es opcional (extra `speedups`); sin él se negocia solo gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Por debajo de este tamaño comprimir no compensa
+MIN_COMPRESS_BYTES = 500
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def dumps(obj) -> bytes:
+    """Codifica a JSON (UTF-8, compacto y sin ordenar las claves)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_items(items) -> bytes:
+    """
+    Lista de productos como JSON. Cada Product aporta su fragmento ya codificado
+    (se codifica una vez y se reutiliza desde la cache); los dicts se codifican acá.
+    """
+    return b"[" + b",".join(
+        item.encoded(dumps) if isinstance(item, Product) else dumps(item)
+        for item in items
+    ) + b"]"
+
+
+def encode(payload: dict) -> bytes:
+    """Codifica `payload`; si trae "items", esa lista se arma con `encode_items`."""
+    if "items" not in payload:
+        return dumps(payload)
+    rest = {key: value for key, value in payload.items() if key != "items"}
+    head = dumps(rest)[:-1]  # sin la "}" final
+    separator = b"," if rest else b""
+    return head + separator + b'"items":' + encode_items(payload["items"]) + b"}"
+
+
+def json_response(payload: dict, status: int = 200) -> Response:
+    """
+    Respuesta JSON con ETag: un hash del contenido más la versión del esquema de
+    Product, así cambia cuando cambian los resultados de los proveedores (o su
+    formato). Si el cliente manda ese ETag en If-None-Match se responde 304 sin cuerpo.
+    """
+    body = encode(payload)
+    response = Response(body, status=status, mimetype="application/json")
+    if status == 200:
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        # débil: el mismo ETag vale para la versión comprimida y la sin comprimir
+        response.set_etag(f"v{SCHEMA_VERSION}-{digest}", weak=True)
+        # el cliente puede guardar la respuesta pero tiene que revalidarla siempre
+        response.headers["Cache-Control"] = "no-cache"
+        response.make_conditional(request)
+    return response
+
+
+def compress_response(response: Response) -> Response:
+    """
+    `after_request` de los blueprints: comprime con brotli o gzip según el
+    Accept-Encoding del cliente. Los streams (NDJSON) se dejan como están para
+    no retener las líneas hasta el final.
+    """
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    # el 304 tiene que llevar el mismo Vary que el 200 que revalida
+    if response.status_code in (200, 304):
+        response.vary.add("Accept-Encoding")
+    if response.status_code != 200 or "Content-Encoding" in response.headers:
+        return response
+
+    available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    encoding = request.accept_encodings.best_match(available)
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_BYTES:
+        return response
+    if encoding == "br":
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
@@ -1,13 +1,95 @@
+import heapq
+from itertools import islice
+
+from app.services.clustering import cluster_products
+
+# Criterios de orden para combinar resultados de varios proveedores:
+# criterio -> (atributo de Product, descendente). `relevance` respeta el
+# orden en que cada proveedor devolvió sus productos.
+CRITERIOS_ORDEN = {
+    "price": ("price", False),
+    "discount": ("discount", True),
+    "relevance": (None, False),
+}
+
+
+def _numero(valor):
+    """Convierte el valor a float si es un número o un texto numérico ("1.234", "15"); si no, None."""
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, str):
+        limpio = valor.strip().replace(".", "").replace(",", ".")
+        try:
+            return float(limpio)
+        except ValueError:
+            return None
+    return None
+
+
 def ordenar_por_campo(lista, campo, descendente=False):
     """
     Ordena una lista de objetos (dicts) por el campo especificado.
     Si el campo no existe o es None, lo pone al final.
     """
-    def clave(obj):
+    # La clave de cada objeto se calcula una sola vez; los textos numéricos se
+    # comparan como números y el resto como texto, sin mezclar tipos
+    con_valor = []
+    sin_valor = []
+    for obj in lista:
         valor = obj.get(campo)
-        if isinstance(valor, str) and valor.replace(".", "").isdigit():
-            return float(valor.replace(".", ""))
-        return valor if valor is not None else float('inf') if not descendente else float('-inf')
+        if valor is None:
+            sin_valor.append(obj)
+            continue
+        numero = _numero(valor)
+        clave = (0, numero, "") if numero is not None else (1, 0.0, str(valor))
+        con_valor.append((clave, obj))
+
+    con_valor.sort(key=lambda par: par[0], reverse=descendente)
+    return [obj for _, obj in con_valor] + sin_valor
+
 
-    return sorted(lista, key=clave, reverse=descendente)
+def _con_claves(lista, fuente, atributo, descendente):
+    """Decora cada producto con su clave de orden ya calculada y lo ordena."""
+    decorada = []
+    for posicion, item in enumerate(lista):
+        if atributo is None:
+            clave = posicion
+        else:
+            valor = _numero(getattr(item, atributo))
+            if valor is None:
+                clave = float("inf")  # sin valor: al final
+            else:
+                clave = -valor if descendente else valor
+        # (posición, fuente) desempatan, así nunca se comparan los productos
+        decorada.append((clave, posicion, fuente, item))
+    if atributo is not None:
+        decorada.sort()
+    return decorada
 
+
+def mezclar_ordenado(listas, limit, criterio="relevance"):
+    """
+    Combina las listas de cada proveedor y devuelve los `limit` primeros según
+    `criterio` (ver CRITERIOS_ORDEN), con un heap de k vías: O(n log k) para k
+    proveedores, y se corta apenas se juntan `limit` productos.
+    """
+    atributo, descendente = CRITERIOS_ORDEN[criterio]
+    streams = [
+        _con_claves(lista, fuente, atributo, descendente)
+        for fuente, lista in enumerate(listas)
+        if lista
+    ]
+    return [entrada[-1] for entrada in islice(heapq.merge(*streams), limit)]
+
+
+def combinar(listas, limit, orden="relevance", agrupar=False):
+    """
+    Los `limit` mejores según `orden` entre todos los proveedores. Con `agrupar`,
+    primero se juntan los productos iguales de distintos proveedores y queda el
+    más barato de cada grupo (ver clustering.py).
+    """
+    if not agrupar:
+        return mezclar_ordenado(listas, limit, orden)
+    return cluster_products(mezclar_ordenado(listas, None, orden))[:limit]
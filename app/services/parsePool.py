@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Cantidad de procesos para parsear HTML. Con 0 (por defecto) se parsea en el
+# mismo proceso, como antes; conviene ajustarlo a los núcleos de cada deploy.
+PARSE_POOL_SIZE = int(os.getenv("PARSE_POOL_SIZE", 0))
+
+_pool = None
+_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            # "spawn": el proceso principal tiene hilos (loop compartido, pools),
+            # y hacer fork con hilos vivos no es seguro
+            _pool = ProcessPoolExecutor(
+                max_workers=PARSE_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def parse_in_pool(parse_func, *args):
+    """
+    Ejecuta `parse_func(*args)` en el pool de procesos para no ocupar el event
+    loop con BeautifulSoup. `parse_func` tiene que ser una función de módulo
+    (se envía por pickle) que recibe el HTML crudo y devuelve la lista de productos.
+    """
+    if PARSE_POOL_SIZE <= 0:
+        return parse_func(*args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_pool(), parse_func, *args)
+    except BrokenProcessPool as e:
+        # un worker murió (por ejemplo por memoria): se recrea el pool y se parsea acá
+        logger.warning(f"[parsePool] Pool de procesos roto, se recrea: {e}")
+        _reset_pool()
+        return parse_func(*args)
+
+
+def shutdown_parse_pool():
+    _reset_pool()
@@ -0,0 +1,181 @@
+import os
+import re
+import time
+
+import httpx
+
+from app.services.htmlParser import make_soup, only
+from app.services.httpClient import get_client
+from app.services.product import Product
+
+# Con el modo AJAX se pide el listado como JSON al mismo controlador de
+# búsqueda (PrestaShop responde JSON cuando recibe `ajax=1`), en lugar de la
+# página completa. Si la tienda no lo soporta se usa el HTML.
+PRESTASHOP_AJAX = os.getenv("PRESTASHOP_AJAX", "1") == "1"
+
+
+async def fetch_prestashop(store: dict, search: str, limit: int = 15):
+    """
+    Busca en una tienda PrestaShop configurada por `store` y devuelve los
+    productos normalizados. Claves de `store`:
+
+        provider, source, logo: identificación de la tienda
+        search_url, params:     URL del controlador de búsqueda y parámetros fijos
+        headers:                headers de la petición
+        ajax:                   si la tienda acepta el modo AJAX/JSON
+        container:              (etiqueta, clase) de cada producto en el HTML
+        fields:                 campo -> (selector CSS, atributo o None para el texto)
+        stock:                  (selector, atributo o None, texto esperado) o None si siempre hay stock
+    """
+    if not search:
+        return []
+
+    params = {**store.get("params", {}), "s": search}
+    client = get_client(store["search_url"])
+    start_time = time.time()  # <--- inicio del timer
+
+    try:
+        products = None
+        if PRESTASHOP_AJAX and store.get("ajax"):
+            products = await _fetch_ajax(client, store, params, limit)
+
+        if products is None:
+            res = await client.get(store["search_url"], params=params, headers=store["headers"])
+            res.raise_for_status()
+            products = extract_products_html(store, res.text, limit)
+
+        end_time = time.time()  # <--- fin del timer
+        print(
+            f"[Servidor - {store['source']}] Tiempo de respuesta de la peticion: {end_time - start_time:.2f} segundos"
+        )  # <--- solo para logs
+        return products
+
+    except httpx.RequestError as e:
+        print("Error de conexión:", e)
+        raise
+    except httpx.HTTPStatusError as e:
+        print(f"Error HTTP: {e.response.status_code} - {e.response.text[:200]}")
+        raise
+
+
+async def _fetch_ajax(client, store, params, limit):
+    """Pide el listado en JSON. Devuelve None si la respuesta no es el JSON esperado."""
+    headers = {
+        **store["headers"],
+        "Accept": "application/json, text/javascript, */*; q=0.01",
+        "X-Requested-With": "XMLHttpRequest",
+    }
+    res = await client.get(store["search_url"], params={**params, "ajax": 1}, headers=headers)
+    if res.status_code != 200 or "json" not in res.headers.get("content-type", ""):
+        return None
+    try:
+        data = res.json()
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("products"), list):
+        return None
+    return [map_ajax_product(store, product) for product in data["products"][:limit]]
+
+
+def map_ajax_product(store, product):
+    """Convierte un producto del JSON de PrestaShop al formato normalizado."""
+    cover = product.get("cover") or {}
+    image_url = (
+        (cover.get("large") or {}).get("url")
+        or (cover.get("medium") or {}).get("url")
+        or store["logo"]
+    )
+    discount = product.get("discount_percentage")
+    if product.get("has_discount") and discount:
+        discount = re.sub(r"[^\d,\.]", "", str(discount)) or None
+    else:
+        discount = None
+
+    if store.get("stock") is None:
+        stock = 1
+    else:
+        stock = 1 if product.get("availability") in ("available", "last_remaining_items") else 0
+
+    return Product(
+        id=str(product.get("id_product")) if product.get("id_product") is not None else None,
+        name=product.get("name"),
+        price_text=product.get("price"),
+        price=product.get("price_amount"),
+        image=image_url,
+        link=product.get("url"),
+        stock=stock,
+        source=store["source"],
+        brand=product.get("manufacturer_name") or None,
+        category=product.get("category_name") or None,
+        reference=product.get("reference") or None,
+        discount=discount,
+        logo=store["logo"],
+    )
+
+
+def extract_products_html(store, html, limit):
+    """Único bucle de extracción HTML, guiado por los selectores de la tienda."""
+    tag, css_class = store["container"]
+    soup = make_soup(html, store["provider"], only(tag, class_=css_class))
+
+    products = []
+    for product_div in soup.find_all(tag, class_=css_class)[:limit]:
+        try:
+            products.append(extract_product_data(store, product_div))
+        except Exception as e:
+            print("Error encontrado:", e)
+    return products
+
+
+def _pick(node, selector, attr):
+    tag = node.select_one(selector)
+    if tag is None:
+        return None
+    if attr is None:
+        return tag.get_text(" ", strip=True)
+    return tag.get(attr)
+
+
+def _parse_price(price_content, price_short):
+    try:
+        return float(price_content)
+    except (ValueError, TypeError):
+        pass
+    if not price_short:
+        return None
+    # fallback: limpiar texto ("$ 1.234,50" → 1234.5)
+    clean_price = re.sub(r"[^\d,\.]", "", price_short)
+    clean_price = clean_price.replace(".", "").replace(",", ".")
+    try:
+        return float(clean_price)
+    except ValueError:
+        return None
+
+
+def extract_product_data(store, product_div):
+    values = {
+        field: _pick(product_div, selector, attr)
+        for field, (selector, attr) in store["fields"].items()
+    }
+
+    stock = 1
+    if store.get("stock") is not None:
+        selector, attr, expected = store["stock"]
+        found = _pick(product_div, selector, attr)
+        stock = 1 if found and expected in found else 0
+
+    return Product(
+        id=values.get("product_id") or product_div.get("data-id-product"),
+        name=values.get("name"),
+        price_text=values.get("price_short"),
+        price=_parse_price(values.get("price_content"), values.get("price_short")),
+        image=values.get("image_url") or store["logo"],
+        link=values.get("link"),
+        stock=stock,
+        source=store["source"],
+        brand=values.get("brandName"),
+        category=values.get("category"),
+        reference=values.get("reference"),
+        discount=None,
+        logo=store["logo"],
+    )
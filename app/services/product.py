@@ -0,0 +1,151 @@
+# Registro único de producto que arman todos los scrapers.
+#
+# Las respuestas de la API mantienen los dos formatos JSON de siempre:
+#
+# - "materiales" (Montessi, Forte, Sagosa, Easy, ...):
+#   product_id, name, price_short, price_number, image_url, link, stock, source,
+#   brandName, category, reference, discountPercentage, logo
+# - "consumo" (Carrefour, MásOnline, La Anónima):
+#   id, image, link, name, price, source, unit, unitPrice, brandName
+#
+# `encoded` arma el JSON de cada producto en su formato (ver SERIALIZERS) y
+# `to_record`/`from_record` la forma compacta que se guarda en el almacenamiento
+# en disco. Cualquier cambio de campos o de formato tiene que subir SCHEMA_VERSION.
+
+SCHEMA_VERSION = 1
+
+MATERIALES = "materiales"
+CONSUMO = "consumo"
+
+
+class Product:
+    FIELDS = (
+        "shape", "id", "name", "price", "price_text", "image", "link", "stock",
+        "source", "brand", "category", "reference", "discount", "unit",
+        "unit_price", "logo", "offers", "alternatives",
+    )
+    # `_encoded` guarda el JSON ya codificado del producto (ver `encoded`)
+    __slots__ = FIELDS + ("_encoded",)
+
+    # Nombres de los formatos JSON -> atributo, para el código que todavía lee
+    # los productos como dicts (`product.get("price_number")`)
+    LEGACY_FIELDS = {
+        "product_id": "id",
+        "price_short": "price_text",
+        "price_number": "price",
+        "image_url": "image",
+        "brandName": "brand",
+        "discountPercentage": "discount",
+        "unitPrice": "unit_price",
+    }
+
+    def __init__(self, shape=MATERIALES, id=None, name=None, price=None, price_text=None,
+                 image=None, link=None, stock=None, source=None, brand=None, category=None,
+                 reference=None, discount=None, unit=None, unit_price=None, logo=None,
+                 offers=None, alternatives=None):
+        self.shape = shape
+        self.id = id
+        self.name = name
+        self.price = price
+        self.price_text = price_text
+        self.image = image
+        self.link = link
+        self.stock = stock
+        self.source = source
+        self.brand = brand
+        self.category = category
+        self.reference = reference
+        self.discount = discount
+        self.unit = unit
+        self.unit_price = unit_price
+        self.logo = logo
+        self.offers = offers
+        self.alternatives = alternatives
+        self._encoded = None
+
+    def get(self, field, default=None):
+        value = getattr(self, self.LEGACY_FIELDS.get(field, field), None)
+        return default if value is None else value
+
+    def replace(self, **changes):
+        """Copia del producto con algunos campos cambiados."""
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        values.update(changes)
+        return Product(**values)
+
+    def to_record(self):
+        return [SCHEMA_VERSION] + [getattr(self, field) for field in self.FIELDS]
+
+    @classmethod
+    def from_record(cls, record):
+        """Reconstruye un producto guardado con `to_record`; None si es de otra versión del esquema."""
+        if not isinstance(record, list) or not record or record[0] != SCHEMA_VERSION:
+            return None
+        return cls(**dict(zip(cls.FIELDS, record[1:])))
+
+    def encoded(self, dumps) -> bytes:
+        """
+        JSON del producto en el formato de la API, codificado con `dumps` una
+        sola vez: los productos de la cache se reutilizan entre respuestas y no
+        se modifican después de armados (`replace` devuelve una copia).
+        """
+        if self._encoded is None:
+            self._encoded = dumps(SERIALIZERS[SCHEMA_VERSION][self.shape](self))
+        return self._encoded
+
+    def __eq__(self, other):
+        if not isinstance(other, Product):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+    def __repr__(self):
+        return f"Product({self.source!r}, {self.name!r}, {self.price!r})"
+
+
+def _materiales(p: Product) -> dict:
+    data = {
+        "product_id": p.id,
+        "name": p.name,
+        "price_short": p.price_text,
+        "price_number": p.price,
+        "image_url": p.image,
+        "link": p.link,
+        "stock": p.stock,
+        "source": p.source,
+        "brandName": p.brand,
+        "category": p.category,
+        "reference": p.reference,
+        "discountPercentage": p.discount,
+        "logo": p.logo,
+    }
+    return _grouping(p, data)
+
+
+def _consumo(p: Product) -> dict:
+    data = {
+        "id": p.id,
+        "image": p.image,
+        "link": p.link,
+        "name": p.name,
+        "price": p.price,
+        "source": p.source,
+        "unit": p.unit,
+        "unitPrice": p.unit_price,
+        "brandName": p.brand,
+    }
+    return _grouping(p, data)
+
+
+def _grouping(p: Product, data: dict) -> dict:
+    # campos que agrega el agrupado de productos (ver clustering.py)
+    if p.offers is not None:
+        data["offers"] = p.offers
+        data["alternatives"] = p.alternatives or []
+    return data
+
+
+# Serializadores por versión del esquema y formato
+SERIALIZERS = {
+    1: {MATERIALES: _materiales, CONSUMO: _consumo},
+}
+
@@ -0,0 +1,186 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.backgroundLoop import submit
+from app.services.circuitBreaker import circuit_breakers
+from app.services.hedging import hedge_budget, hedged, hedging_enabled
+from app.services.cache import normalize_query, result_cache
+from app.services.resultStore import result_store
+from app.services.singleFlight import single_flight
+from app.services.timeouts import PROVIDER_TIMEOUTS, timeout_manager
+
+logger = logging.getLogger(__name__)
+
+# Tiempo máximo de un refresco en segundo plano
+REFRESH_TIMEOUT = 60
+
+# Timeout inicial en segundos de los scrapers sin timeout propio, hasta que el
+# timeout adaptativo tenga mediciones
+DEFAULT_TIMEOUT = 20
+
+# Pool acotado para los scrapers sincrónicos, así no bloquean el event loop
+_sync_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SYNC_SCRAPER_WORKERS", 8)),
+    thread_name_prefix="sync-scraper",
+)
+
+# Claves (proveedor, query) con un refresco en curso, para no lanzar dos iguales
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+async def _fetch(proveedor: str, scraper, search: str, limit: int):
+    # Búsquedas idénticas en curso comparten un único scrape
+    key = (proveedor, normalize_query(search), limit)
+    return await single_flight.do(key, lambda: _scrape(proveedor, scraper, search, limit))
+
+
+async def _scrape(proveedor: str, scraper, search: str, limit: int):
+    # Con el circuito abierto se falla al instante en lugar de esperar el timeout
+    circuit_breakers.acquire(proveedor)
+
+    # El timeout sale de la latencia reciente del proveedor; mientras no hay
+    # mediciones se usa el inicial del proveedor o el de su decorador
+    default = PROVIDER_TIMEOUTS.get(proveedor) or getattr(scraper, "timeout", DEFAULT_TIMEOUT)
+    timeout = timeout_manager.timeout_for(proveedor, default=default)
+    start_time = time.monotonic()
+    try:
+        if asyncio.iscoroutinefunction(scraper):
+            # se llama a la función sin decorar para que los errores lleguen hasta acá
+            raw = getattr(scraper, "__wrapped__", scraper)
+            hedge_delay = None
+            if hedging_enabled(proveedor):
+                hedge_delay = timeout_manager.latency(proveedor, hedge_budget.percentile)
+            if hedge_delay is not None:
+                # si tarda más que su p90 se lanza un segundo intento (ver hedging.py)
+                call = hedged(lambda: raw(search, limit), hedge_delay)
+            else:
+                call = raw(search, limit)
+            items = await asyncio.wait_for(call, timeout=timeout)
+        else:
+            items = await _run_sync_scraper(scraper, search, limit, timeout)
+    except asyncio.TimeoutError:
+        timeout_manager.record_timeout(proveedor, timeout)
+        circuit_breakers.record_failure(proveedor)
+        raise TimeoutError(f"{proveedor} superó el timeout de {timeout:.1f}s") from None
+    except asyncio.CancelledError:
+        circuit_breakers.release(proveedor)
+        raise
+    except Exception:
+        circuit_breakers.record_failure(proveedor)
+        raise
+    timeout_manager.record(proveedor, time.monotonic() - start_time)
+    circuit_breakers.record_success(proveedor)
+
+    if isinstance(items, list):
+        result_cache.set(proveedor, search, limit, items)
+        if result_store is not None and items:
+            await _save_to_store(proveedor, search, limit, items)
+    return items
+
+
+async def _run_sync_scraper(scraper, search: str, limit: int, timeout: float):
+    """
+    Ejecuta un scraper bloqueante (estilo `requests`) en el pool de hilos, con
+    el timeout del proveedor. Si vence, el hilo termina solo pero el resultado
+    se descarta.
+    """
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(
+        loop.run_in_executor(_sync_executor, functools.partial(scraper, search, limit)),
+        timeout=timeout,
+    )
+
+
+async def _load_from_store(proveedor: str, search: str, limit: int, allow_stale: bool):
+    """
+    Busca el resultado en el almacenamiento en disco y, si sirve, lo sube a la
+    cache en memoria. Devuelve `(items, fresco)` o None.
+    """
+    if result_store is None:
+        return None
+    try:
+        row = await asyncio.to_thread(result_store.get, proveedor, search, limit)
+    except Exception as e:
+        logger.warning(f"[run_provider] Error leyendo el almacenamiento de {proveedor}: {e}")
+        return None
+    if row is None:
+        return None
+
+    items, age, cached_limit = row
+    fresh = age < result_cache.ttl_for(proveedor)
+    if not fresh and not allow_stale:
+        return None
+    result_cache.set(proveedor, search, cached_limit, items, age=age)
+    return items[:limit], fresh
+
+
+async def _save_to_store(proveedor: str, search: str, limit: int, items):
+    # una falla al escribir (ej. "database is locked") no descarta el scrape
+    try:
+        await asyncio.to_thread(result_store.set, proveedor, search, limit, items)
+    except Exception as e:
+        logger.warning(f"[run_provider] Error guardando en el almacenamiento de {proveedor}: {e}")
+
+
+def _refresh_in_background(proveedor: str, scraper, search: str, limit: int):
+    # se refresca con el limit de la entrada guardada si es mayor, para no
+    # reemplazarla por un resultado más chico
+    limit = max(limit, result_cache.cached_limit(proveedor, search) or 0)
+    key = (proveedor, normalize_query(search), limit)
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def done(future):
+        with _refreshing_lock:
+            _refreshing.discard(key)
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"[run_provider] Error refrescando {proveedor}: {future.exception()}")
+
+    future = submit(
+        asyncio.wait_for(_fetch(proveedor, scraper, search, limit), timeout=REFRESH_TIMEOUT)
+    )
+    future.add_done_callback(done)
+
+
+async def run_provider(proveedor: str, scraper, search: str, limit: int,
+                       use_cache: bool = True, allow_stale: bool = True):
+    """
+    Punto único por el que los controllers consultan a un proveedor.
+
+    Busca primero en la cache; si no hay resultado vigente ejecuta el scraper
+    y guarda lo obtenido. Los scrapers sincrónicos corren en un pool de hilos. Con `use_cache=False` se saltea la
+    lectura pero el resultado nuevo igual actualiza la cache.
+
+    Con `allow_stale`, un resultado vencido pero dentro de su edad máxima se
+    devuelve al instante y se refresca en segundo plano (stale-while-revalidate).
+
+    Si está configurado el almacenamiento en disco (`RESULT_STORE_PATH`), se
+    consulta después de la cache en memoria y antes de scrapear.
+
+    Si ya hay un scrape igual (proveedor, query, limit) en curso, se espera
+    ese mismo resultado en lugar de lanzar otro.
+
+    Cada scrape tiene el timeout adaptativo del proveedor (ver timeouts.py); si
+    vence o el scraper falla, el error se propaga a quien llamó. Varias fallas
+    seguidas abren el circuito del proveedor y, mientras esté abierto, se lanza
+    CircuitOpenError sin scrapear (ver circuitBreaker.py).
+    """
+    if use_cache:
+        hit = result_cache.lookup(proveedor, search, limit, allow_stale=allow_stale)
+        if hit is None:
+            hit = await _load_from_store(proveedor, search, limit, allow_stale)
+        if hit is not None:
+            items, fresh = hit
+            if not fresh:
+                _refresh_in_background(proveedor, scraper, search, limit)
+            return items
+
+    return await _fetch(proveedor, scraper, search, limit)
@@ -0,0 +1,90 @@
+import os
+from urllib.parse import urlsplit
+
+# Bloqueo de recursos en las búsquedas con Playwright: para extraer productos
+# solo hacen falta el documento, los scripts y las llamadas XHR/fetch.
+BLOCK_RESOURCES = os.getenv("BROWSER_BLOCK_RESOURCES", "1") == "1"
+
+# Tipos de recurso que se cancelan por defecto
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Con BLOCK_THIRD_PARTY se cancelan los pedidos a hosts fuera del dominio
+# del proveedor (PROVIDER_DOMAINS) y de su lista de excepciones
+BLOCK_THIRD_PARTY = os.getenv("BROWSER_BLOCK_THIRD_PARTY", "1") == "1"
+
+# Hosts de la plataforma VTEX: sirven los scripts y la API de las tiendas VTEX
+VTEX_HOSTS = {"vtexassets.com", "vteximg.com.br", "vtex.com", "vtex.com.br", "vtexcommercestable.com.br"}
+
+# Dominios propios de cada proveedor (incluye sus subdominios). Un proveedor
+# sin entrada acá solo bloquea los hosts de BLOCKED_HOSTS
+PROVIDER_DOMAINS = {
+    "easy": {"easy.com.ar"} | VTEX_HOSTS,
+    "carrefour": {"carrefour.com.ar"} | VTEX_HOSTS,
+    "masonline": {"masonline.com.ar"} | VTEX_HOSTS,
+    "laanonima": {"laanonima.com.ar"},
+}
+
+# Hosts de analítica, publicidad y trackers (también bloquea sus subdominios).
+# Se bloquean siempre, aunque no esté activo BLOCK_THIRD_PARTY
+BLOCKED_HOSTS = {
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "clarity.ms",
+    "tiktok.com",
+    "criteo.com",
+    "criteo.net",
+    "newrelic.com",
+    "nr-data.net",
+    "bing.com",
+    "onesignal.com",
+    "zendesk.com",
+    "zdassets.com",
+}
+
+# Excepciones por proveedor: tipos de recurso y hosts que sí se dejan pasar
+PROVIDER_ALLOWLISTS = {
+    # el scraper lee `window.dataLayer`: se deja pasar Tag Manager para no alterarlo
+    "easy": {"resource_types": set(), "hosts": {"googletagmanager.com"}},
+    "carrefour": {"resource_types": set(), "hosts": set()},
+    "masonline": {"resource_types": set(), "hosts": set()},
+    "laanonima": {"resource_types": set(), "hosts": set()},
+}
+
+
+def _matches_host(host: str, hosts) -> bool:
+    return any(host == h or host.endswith("." + h) for h in hosts)
+
+
+def should_block(provider: str, resource_type: str, url: str) -> bool:
+    allow = PROVIDER_ALLOWLISTS.get(provider, {})
+    if resource_type in BLOCKED_RESOURCE_TYPES and resource_type not in allow.get("resource_types", ()):
+        return True
+    host = (urlsplit(url).hostname or "").lower()
+    # data:, blob: y similares no salen a la red
+    if not host or _matches_host(host, allow.get("hosts", ())):
+        return False
+    if _matches_host(host, BLOCKED_HOSTS):
+        return True
+    domains = PROVIDER_DOMAINS.get(provider)
+    return BLOCK_THIRD_PARTY and domains is not None and not _matches_host(host, domains)
+
+
+async def install(context, provider: str):
+    """Registra en el contexto de Playwright la política de bloqueo de `provider`."""
+    if not BLOCK_RESOURCES:
+        return
+
+    async def handle(route):
+        request = route.request
+        if should_block(provider, request.resource_type, request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle)
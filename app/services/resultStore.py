@@ -0,0 +1,160 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from app.services.cache import normalize_query, result_cache
+from app.services.product import Product
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    provider    TEXT NOT NULL,
+    query       TEXT NOT NULL,
+    lim         INTEGER NOT NULL,
+    stored_at   REAL NOT NULL,
+    stale_until REAL NOT NULL,
+    items       TEXT NOT NULL,
+    PRIMARY KEY (provider, query)
+);
+CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at);
+CREATE INDEX IF NOT EXISTS results_stale_until ON results (stale_until);
+"""
+
+
+class ResultStore:
+    """
+    Guarda en SQLite los resultados por (proveedor, búsqueda normalizada) para
+    que un worker recién iniciado pueda responder sin volver a scrapear.
+
+    - Las lecturas respetan las ventanas de la cache en memoria (`PROVIDER_TTL`
+      y `PROVIDER_MAX_STALE`) y devuelven la edad del resultado.
+    - Cada `compact_every` escrituras se borran los vencidos y, si el archivo
+      supera `max_bytes`, las entradas más viejas hasta volver al límite.
+    """
+
+    def __init__(self, path: str, max_bytes=50 * 1024 * 1024, compact_every=200):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compact_every = compact_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, provider: str, search: str, limit: int):
+        """
+        Devuelve `(items, edad_en_segundos, limit_guardado)` o None si no hay un
+        resultado utilizable. Se devuelven todos los productos guardados (pueden
+        ser más que `limit`), así la cache en memoria conserva la entrada completa.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT lim, stored_at, stale_until, items FROM results WHERE provider = ? AND query = ?",
+                (provider, normalize_query(search)),
+            ).fetchone()
+        if row is None:
+            return None
+
+        cached_limit, stored_at, stale_until, raw_items = row
+        now = time.time()
+        if stale_until <= now:
+            return None
+        # sirve si se pidió lo mismo o menos, o si el proveedor no tenía más
+        records = json.loads(raw_items)
+        if limit > cached_limit and len(records) >= cached_limit:
+            return None
+        items = [Product.from_record(record) for record in records]
+        if any(item is None for item in items):
+            return None  # guardado con otra versión del esquema de Product
+        return items, now - stored_at, cached_limit
+
+    def set(self, provider: str, search: str, limit: int, items):
+        if not items:
+            return
+        now = time.time()
+        records = [item.to_record() for item in items]
+        raw_items = json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            # una fila vigente guardada con un limit mayor no se pisa con una más chica
+            self._conn.execute(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (provider, query) DO UPDATE SET "
+                "lim = excluded.lim, stored_at = excluded.stored_at, "
+                "stale_until = excluded.stale_until, items = excluded.items "
+                "WHERE excluded.lim >= results.lim OR results.stale_until <= excluded.stored_at",
+                (
+                    provider,
+                    normalize_query(search),
+                    limit,
+                    now,
+                    now + result_cache.max_stale_for(provider),
+                    raw_items,
+                ),
+            )
+            self._writes += 1
+            if self._writes % self.compact_every == 0:
+                self._compact()
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        removed = self._conn.execute(
+            "DELETE FROM results WHERE stale_until <= ?", (time.time(),)
+        ).rowcount
+        # borra en tandas los más viejos hasta quedar bajo el límite de tamaño
+        while self._size_bytes() > self.max_bytes:
+            deleted = self._conn.execute(
+                "DELETE FROM results WHERE rowid IN "
+                "(SELECT rowid FROM results ORDER BY stored_at LIMIT 50)"
+            ).rowcount
+            if not deleted:
+                break
+            removed += deleted
+        if not removed:
+            return
+        # devuelve al disco las páginas liberadas
+        self._conn.execute("VACUUM")
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _size_bytes(self):
+        # páginas en uso (las liberadas por DELETE quedan en la freelist hasta el VACUUM)
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return {
+                "path": self.path,
+                "rows": rows,
+                "bytes": self._size_bytes(),
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _open_store():
+    # Opcional: solo se activa si el deploy define RESULT_STORE_PATH
+    # (en Vercel el único directorio escribible es /tmp)
+    path = os.getenv("RESULT_STORE_PATH")
+    if not path:
+        return None
+    try:
+        return ResultStore(
+            path,
+            max_bytes=int(os.getenv("RESULT_STORE_MAX_MB", 50)) * 1024 * 1024,
+        )
+    except sqlite3.Error as e:
+        logger.warning(f"[resultStore] No se pudo abrir {path}: {e}")
+        return None
+
+
+result_store = _open_store()
@@ -1,5 +1,8 @@
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from app.services.htmlParser import make_soup, only
+from app.services.browserPool import lease
+from app.services.vtexAdapter import fetch_vtex, vtex_json_enabled
+from app.services.parsePool import parse_in_pool
+from app.services.product import CONSUMO, Product
 import time
 import asyncio, json
 
@@ -15,32 +18,49 @@ async def fetch_data_layer_items(search: str, limit: int = 20):
         len(search) < 3
     ):  # esto previene busquedas innecesarias para palabras menores de 3
         return []
+
+    # Camino rápido: API JSON de VTEX por HTTP; Playwright queda como respaldo
+    if vtex_json_enabled("carrefour"):
+        products = await fetch_vtex("carrefour", search, limit)
+        if products is not None:
+            return products
+
     search = search.replace(" ", "%20")
     
     # Construye la URL de búsqueda con parámetros específicos para Easy
     url = f"https://www.carrefour.com.ar/{search}t?_q={search}t"
     start_time = time.time()  # <--- inicio del timer
-    # Inicia Playwright en modo asincrónico
-    async with async_playwright() as p:
-        try:
-            browser = await p.chromium.launch(headless=True)  # Sin interfaz gráfica
-            page = await browser.new_page()
-
+    # Toma una página del pool de Chromium (el navegador ya está lanzado)
+    try:
+        async with lease("carrefour") as page:
             # Navega a la URL y espera que la red esté inactiva (carga completa)
             await page.goto(url, timeout=10000)
 
             html = await page.content()
             # data_layer = await page.evaluate("window.dataLayer")
+    except Exception as e:
 
-            # Cierra el navegador para liberar recursos
-            await browser.close()
-        except Exception as e:
+        raise RuntimeError(f"No se encontró el contenedor de productos: {e}")
+        # return []
+
+    end_time = time.time()  # <--- fin del timer
+    print(
+        f"[Servidor - consulta a carrefour] Tiempo de respuesta de la peticion: {end_time - start_time:.2f} segundos"
+    )  # <--- solo para logs
 
-            raise RuntimeError(f"No se encontró el contenedor de productos: {e}")
-            # return []
+    # Parseo y extracción fuera del event loop (pool de procesos si está configurado)
+    return await parse_in_pool(parse_products, html, limit)
 
-    # Parsea el HTML con BeautifulSoup
-    soup = BeautifulSoup(html, "html.parser")
+
+def parse_products(html, limit):
+    """
+    Parsea el HTML renderizado de Carrefour y devuelve hasta `limit` productos.
+    Es una función de módulo para poder ejecutarse en el pool de procesos.
+    """
+    # Parsea solo el subárbol de productos
+    soup = make_soup(
+        html, "carrefour", only("div", class_="valtech-carrefourar-search-result-3-x-gallery")
+    )
 
     # Busca el contenedor principal de productos
     product_divs = soup.find(
@@ -56,10 +76,6 @@ async def fetch_data_layer_items(search: str, limit: int = 20):
     )
 
     products = []
-    end_time = time.time()  # <--- fin del timer
-    print(
-        f"[Servidor - consulta a carrefour] Tiempo de respuesta de la peticion: {end_time - start_time:.2f} segundos"
-    )  # <--- solo para logs
 
     # limite de respuesta
     products_div = products_div[:limit]
@@ -81,8 +97,8 @@ def extract_product_data(product_div):
         Contenedor HTML del producto.
 
     Returns:
-    dict
-        Diccionario con los datos del producto.
+    Product | None
+        Producto con sus datos, o None si no se pudo extraer.
     """
     try:
         start_time = time.time()  # <--- inicio del timer
@@ -137,17 +153,18 @@ def extract_product_data(product_div):
         )
         brandName = brand_tag.text.strip() if brand_tag else None
 
-        return {
-            "id": None,
-            "image": image_url,
-            "link": link,
-            "name": name,
-            "price": price_number,
-            "source": "Carrefour",
-            "unit": "unidad",
-            "unitPrice": price_number,
-            "brandName": brandName,
-        }
+        return Product(
+            shape=CONSUMO,
+            id=None,
+            image=image_url,
+            link=link,
+            name=name,
+            price=price_number,
+            source="Carrefour",
+            unit="unidad",
+            unit_price=price_number,
+            brand=brandName,
+        )
 
     except Exception as e:
         print("Error al extraer producto:", e)
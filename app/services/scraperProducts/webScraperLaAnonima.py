@@ -1,8 +1,26 @@
+import re
 import time
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from app.services.htmlParser import make_soup, only
+from app.services.browserPool import lease
+from app.services.product import CONSUMO, Product
 import asyncio
 
+# Pedidos del scroll infinito que traen la página siguiente del listado (el
+# resto de los XHR de la página no cuentan como progreso)
+_LISTING_URL_RE = re.compile(r"/buscar/|[?&]pag(?:ina)?=", re.I)
+
+# Segundos para que un scroll dispare el pedido de la página siguiente: si no
+# lo dispara, no hay más resultados
+SCROLL_REQUEST_TIMEOUT = 1
+# Segundos máximos para que termine ese pedido
+XHR_IDLE_TIMEOUT = 3
+# Segundos para que los productos del pedido aparezcan en el DOM
+DOM_RENDER_TIMEOUT = 1
+
+# Cantidad de productos renderizados en la página
+_COUNT_ITEMS_JS = "document.querySelectorAll('div.producto-item').length"
+
 async def fetch_products_la_anonima(search: str, limit: int = 20):
     """
     Busca productos en La Anónima simulando scroll y devolviendo
@@ -29,48 +47,90 @@ async def fetch_products_la_anonima(search: str, limit: int = 20):
         {"name": "s_laanonima", "value": "df8d92dab9e0dd0c3cdad5a40707eb2b", "domain": ".api.laanonima.com.ar", "path": "/"},
     ]
     
-    # Scroll automático solo hasta obtener 'limit' productos
-    products_loaded = 0
     start_time = time.time()  # <--- inicio del timer
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            )
+    # Los pedidos del listado avisan que se pidió (y llegó) la página siguiente
+    # del scroll infinito; los productos se cuentan en el DOM, así no importa
+    # el formato de la respuesta
+    requested = asyncio.Event()
+    finished = asyncio.Event()
+
+    def is_listing(request):
+        return request.resource_type in ("xhr", "fetch") and bool(_LISTING_URL_RE.search(request.url))
+
+    def on_request(request):
+        if is_listing(request):
+            requested.set()
+
+    def on_finished(request):
+        if is_listing(request):
+            finished.set()
+
+    # Toma una página del pool de Chromium, con su propio contexto y cookies
+    async with lease(
+        "laanonima",
+        user_agent=(
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/120.0.0.0 Safari/537.36"
         )
-        await context.add_cookies(cookies)
-        page = await context.new_page()
+    ) as page:
+        await page.context.add_cookies(cookies)
+        page.on("request", on_request)
+        page.on("requestfinished", on_finished)
+        page.on("requestfailed", on_finished)
         await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        loaded = await page.evaluate(_COUNT_ITEMS_JS)
 
-        # Scroll automático para cargar productos dinámicos
-        last_height = await page.evaluate("document.body.scrollHeight")
-        while products_loaded < limit:
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await asyncio.sleep(1)  # esperar a que cargue
-                product_divs = await page.query_selector_all("div.producto-item")
-                products_loaded = len(product_divs)
+        # Respaldo: si todavía no se renderizó ningún producto, se los espera en el DOM
+        if loaded == 0:
+            await page.wait_for_selector("div.producto-item", timeout=60000)
+            loaded = await page.evaluate(_COUNT_ITEMS_JS)
 
-                new_height = await page.evaluate("document.body.scrollHeight")
-                if new_height == last_height:  # no se cargó nada nuevo
-                    break
-                last_height = new_height
+        # Scroll hasta juntar 'limit' productos, sin esperas fijas: se corta apenas
+        # un scroll no pide la página siguiente o el pedido no agrega productos
+        while loaded < limit:
+            requested.clear()
+            finished.clear()
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            try:
+                await asyncio.wait_for(requested.wait(), SCROLL_REQUEST_TIMEOUT)
+                await asyncio.wait_for(finished.wait(), XHR_IDLE_TIMEOUT)
+                await page.wait_for_function(
+                    f"{_COUNT_ITEMS_JS} > {loaded}", timeout=DOM_RENDER_TIMEOUT * 1000
+                )
+            except (asyncio.TimeoutError, PlaywrightTimeoutError):
+                break
+            loaded = await page.evaluate(_COUNT_ITEMS_JS)
 
-        await page.wait_for_selector("div.producto-item", timeout=60000)
+        # El HTML se lee al final, con todo lo que cargó el scroll
         html = await page.content()
-        await browser.close()
 
-    # Parsear HTML con BeautifulSoup
-    soup = BeautifulSoup(html, "html.parser")
-    product_divs = soup.select("div.producto-item")
-    products = []
+    products = parse_products(html, limit)
     end_time = time.time()  # <--- fin del timer
     print(f"[Servidor - consulta a la anonima online] Tiempo de respuesta de la peticion: {end_time - start_time:.2f} segundos")  # <--- solo para logs
 
-    for div in product_divs[:limit]:
+    return products
+
+
+def parse_products(html, limit):
+    """Arma los productos a partir del HTML renderizado de la página."""
+    # Parsear solo los productos del HTML
+    soup = make_soup(html, "laanonima", only("div", class_="producto-item"))
+    product_divs = soup.select("div.producto-item")
+    products = []
+    seen = set()
+
+    for div in product_divs:
+        if len(products) >= limit:
+            break
+        codigo = div.get("id-codigo-producto")
+        # el scroll infinito puede repetir algún producto entre páginas
+        if codigo is not None:
+            if codigo in seen:
+                continue
+            seen.add(codigo)
+
         title_tag = div.select_one(".titulo")
         price_tag = div.select_one(".precio span")
         img_tag = div.select_one("img")
@@ -83,22 +143,21 @@ async def fetch_products_la_anonima(search: str, limit: int = 20):
             price = float(price_text) if price_text else None
         except ValueError:
             price = None
-        # print(img_tag)
-        image_url = img_tag.get("data-src", "")
+        image_url = img_tag.get("data-src", "") if img_tag else ""
         link = f"https://www.laanonima.com.ar{link_tag['href']}" if link_tag else None
-        codigo = div.get("id-codigo-producto")
 
-        products.append({
-            "id": codigo,
-            "image": image_url,
-            "link": link,
-            "name": name,
-            "price": price,
-            "source": "La Anónima",
-            "unit": "unidad",
-            "unitPrice": price,
-            "brandName": None  # La página no muestra marca directamente
-        })
+        products.append(Product(
+            shape=CONSUMO,
+            id=codigo,
+            image=image_url,
+            link=link,
+            name=name,
+            price=price,
+            source="La Anónima",
+            unit="unidad",
+            unit_price=price,
+            brand=None,  # La página no muestra marca directamente
+        ))
 
     return products
 
@@ -1,5 +1,7 @@
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from app.services.htmlParser import make_soup, only
+from app.services.browserPool import lease
+from app.services.vtexAdapter import fetch_vtex, vtex_json_enabled
+from app.services.product import CONSUMO, Product
 import time
 import asyncio, json
 async def fetch_data_layer_items(search: str, limit: int = 20):
@@ -11,34 +13,35 @@ async def fetch_data_layer_items(search: str, limit: int = 20):
     
     if (len(search) < 3): # esto previene busquedas innecesarias para palabras menores de 3
         return []
+
+    # Camino rápido: API JSON de VTEX por HTTP; Playwright queda como respaldo
+    if vtex_json_enabled("masonline"):
+        products = await fetch_vtex("masonline", search, limit)
+        if products is not None:
+            return products
+
     search = search.replace(" ","%20")
     
     # Construye la URL de búsqueda con parámetros específicos para Easy
     url = f"https://www.masonline.com.ar/fernet%20branca?_q=fernet+branca"
     start_time = time.time()  # <--- inicio del timer
-    # Inicia Playwright en modo asincrónico
-    async with async_playwright() as p:
-        try:
-            browser = await p.chromium.launch(headless=True)  # Sin interfaz gráfica
-            page = await browser.new_page()
-
+    # Toma una página del pool de Chromium (el navegador ya está lanzado)
+    try:
+        async with lease("masonline") as page:
             # Navega a la URL y espera que la red esté inactiva (carga completa)
             await page.goto(url, timeout=20000, wait_until='domcontentloaded')
-            
+
             await page.wait_for_selector('.valtech-gdn-dynamic-product-1-x-weighablePriceWrapper', timeout=10000)
             html = await page.content()
             # data_layer = await page.evaluate("window.dataLayer")
+    except Exception as e:
 
-            # Cierra el navegador para liberar recursos
-            await browser.close()
-        except Exception as e:
-        
-            # return []
-            raise RuntimeError(f"No se encontró el contenedor de productos: {e}")
+        # return []
+        raise RuntimeError(f"No se encontró el contenedor de productos: {e}")
 
 
-    # Parsea el HTML con BeautifulSoup
-    soup = BeautifulSoup(html, "html.parser")
+    # Parsea solo el subárbol de productos
+    soup = make_soup(html, "masonline", only("div", class_="valtech-gdn-search-result-0-x-gallery"))
 
     # Busca el contenedor principal de productos
     product_divs = soup.find("div", class_="valtech-gdn-search-result-0-x-gallery")
@@ -69,15 +72,15 @@ async def fetch_data_layer_items(search: str, limit: int = 20):
 
 def extract_product_data(product_div):
     """
-    Extrae la información relevante de un producto desde el contenedor HTML de Carrefour.
+    Extrae la información relevante de un producto desde el contenedor HTML de MásOnline.
 
     Args:
     product_div : bs4.element.Tag
         Contenedor HTML del producto.
 
     Returns:
-    dict
-        Diccionario con los datos del producto.
+    Product | None
+        Producto con sus datos, o None si no se pudo extraer.
     """
     try:
         # Nombre del producto
@@ -118,17 +121,18 @@ def extract_product_data(product_div):
         brand_tag = product_div.find("span", class_="vtex-product-summary-2-x-brandName")
         brandName = brand_tag.text.strip() if brand_tag else None
 
-        return {
-            "id": None,
-            "image": image_url,
-            "link": link,
-            "name": name,
-            "price": price_number,
-            "source": "MásOnline",
-            "unit": "unidad",
-            "unitPrice": price_number,
-            "brandName": brandName
-        }
+        return Product(
+            shape=CONSUMO,
+            id=None,
+            image=image_url,
+            link=link,
+            name=name,
+            price=price_number,
+            source="MásOnline",
+            unit="unidad",
+            unit_price=price_number,
+            brand=brandName,
+        )
 
     except Exception as e:
         print("Error al extraer producto:", e)
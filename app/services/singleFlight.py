@@ -0,0 +1,62 @@
+import asyncio
+import concurrent.futures
+import threading
+
+
+class SingleFlight:
+    """
+    Agrupa llamadas idénticas en curso: la primera ("líder") ejecuta el trabajo
+    y las que llegan mientras tanto esperan ese mismo resultado, incluyendo
+    errores y timeouts.
+
+    Funciona entre hilos y event loops distintos, por eso el resultado se
+    publica en un `concurrent.futures.Future`.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key, coro_factory):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                future.set_running_or_notify_cancel()
+                self._calls[key] = future
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            # shield: si este request se cancela (timeout propio), no cancela al resto
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        task = asyncio.ensure_future(coro_factory())
+        task.add_done_callback(lambda t: self._finish(key, future, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key, future, task):
+        with self._lock:
+            self._calls.pop(key, None)
+        if task.cancelled():
+            future.set_exception(RuntimeError(f"Búsqueda compartida cancelada: {key}"))
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "shared": self.shared,
+            }
+
+
+# Instancia compartida por todo el proceso
+single_flight = SingleFlight()
@@ -0,0 +1,116 @@
+import math
+import os
+import threading
+from collections import deque
+
+# Configuración de los timeouts adaptativos (ajustable por variables de entorno)
+TIMEOUT_CONFIG = {
+    "percentile": float(os.getenv("TIMEOUT_PERCENTILE", 0.95)),
+    "multiplier": float(os.getenv("TIMEOUT_MULTIPLIER", 1.5)),
+    "floor": float(os.getenv("TIMEOUT_FLOOR", 2)),
+    "ceiling": float(os.getenv("TIMEOUT_CEILING", 25)),
+    "window": int(os.getenv("TIMEOUT_WINDOW", 50)),
+    "min_samples": int(os.getenv("TIMEOUT_MIN_SAMPLES", 5)),
+}
+
+# Timeout inicial por proveedor, mientras no hay mediciones (los scrapers
+# decorados con `with_timeout_and_log` usan el de su decorador)
+PROVIDER_TIMEOUTS = {
+    "laanonima": 15,
+    "carrefour": 12,
+    "masonline": 10,
+}
+
+# Proveedores que pueden terminar en Playwright. Carrefour, MásOnline y Easy
+# suelen responder por la API JSON de VTEX en menos de un segundo, pero si la API
+# falla el respaldo con Chromium tarda bastante más: su timeout no baja de este piso
+BROWSER_PROVIDERS = {"laanonima", "carrefour", "masonline", "easy"}
+BROWSER_TIMEOUT_FLOOR = float(os.getenv("TIMEOUT_BROWSER_FLOOR", 10))
+PROVIDER_FLOORS = {provider: BROWSER_TIMEOUT_FLOOR for provider in BROWSER_PROVIDERS}
+
+
+class TimeoutManager:
+    """
+    Calcula el timeout de cada proveedor a partir de sus latencias recientes.
+
+    - Guarda las últimas `window` duraciones de scrape por proveedor.
+    - El timeout es el percentil `percentile` de esas duraciones por `multiplier`,
+      acotado entre `floor` (o el piso del proveedor en `provider_floors`) y `ceiling`.
+    - Con menos de `min_samples` mediciones se usa el timeout inicial del
+      proveedor (PROVIDER_TIMEOUTS, el de su decorador o el de run_provider).
+    - Un timeout se registra como una medición igual al límite que venció, así
+      el próximo timeout de ese proveedor crece.
+    - El timeout inicial recibido en `timeout_for` se recuerda para que `stats`
+      muestre el mismo valor que se aplica.
+    """
+
+    def __init__(self, percentile=0.95, multiplier=1.5, floor=2, ceiling=25,
+                 window=50, min_samples=5, provider_floors=None):
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.floor = floor
+        self.provider_floors = provider_floors or {}
+        self.ceiling = ceiling
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+        self._timeouts = {}
+        self._defaults = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(provider)
+            if samples is None:
+                samples = self._samples[provider] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def record_timeout(self, provider: str, seconds: float):
+        self.record(provider, seconds)
+        with self._lock:
+            self._timeouts[provider] = self._timeouts.get(provider, 0) + 1
+
+    def _percentile(self, samples, percentile):
+        ordered = sorted(samples)
+        index = max(math.ceil(percentile * len(ordered)) - 1, 0)
+        return ordered[index]
+
+    def latency(self, provider: str, percentile: float = None):
+        """Percentil de latencia observado (None si todavía no hay suficientes mediciones)."""
+        with self._lock:
+            samples = list(self._samples.get(provider, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return self._percentile(samples, self.percentile if percentile is None else percentile)
+
+    def timeout_for(self, provider: str, default: float = None) -> float:
+        with self._lock:
+            if default is None:
+                default = self._defaults.get(provider)
+            else:
+                self._defaults[provider] = default
+            samples = list(self._samples.get(provider, ()))
+        if len(samples) < self.min_samples:
+            return min(default, self.ceiling) if default is not None else self.ceiling
+        value = self._percentile(samples, self.percentile) * self.multiplier
+        floor = self.provider_floors.get(provider, self.floor)
+        return min(max(value, floor), self.ceiling)
+
+    def stats(self):
+        with self._lock:
+            providers = {p: list(s) for p, s in self._samples.items()}
+            timeouts = dict(self._timeouts)
+        return {
+            provider: {
+                "samples": len(samples),
+                "p50": round(self._percentile(samples, 0.5), 3),
+                f"p{round(self.percentile * 100)}": round(self._percentile(samples, self.percentile), 3),
+                "timeout": round(self.timeout_for(provider), 3),
+                "timeouts": timeouts.get(provider, 0),
+            }
+            for provider, samples in providers.items()
+            if samples
+        }
+
+
+timeout_manager = TimeoutManager(**TIMEOUT_CONFIG, provider_floors=PROVIDER_FLOORS)
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import os
+import time
+
+import httpx
+
+from app.services.httpClient import get_client
+from app.services.product import CONSUMO, MATERIALES, Product
+
+logger = logging.getLogger(__name__)
+
+# Tiendas VTEX que se consultan por su API de búsqueda JSON. `shape` indica el
+# formato de producto que devuelve cada scraper hoy (consumo o materiales).
+VTEX_STORES = {
+    "carrefour": {
+        "base_url": "https://www.carrefour.com.ar",
+        "source": "Carrefour",
+        "shape": CONSUMO,
+    },
+    "masonline": {
+        "base_url": "https://www.masonline.com.ar",
+        "source": "MásOnline",
+        "shape": CONSUMO,
+    },
+    "easy": {
+        "base_url": "https://www.easy.com.ar",
+        "source": "Easy",
+        "shape": MATERIALES,
+        "logo": "https://arcencohogareasy.vtexassets.com/assets/vtex.file-manager-graphql/images/e3cfab5b-2965-44d0-9c58-c3f3ca4b2bac___73d2acbdf5bcfbbcf7de22ba69d9163e.svg",
+    },
+}
+
+# Proveedores que intentan primero la API JSON; Playwright queda como respaldo
+VTEX_JSON_PROVIDERS = set(
+    os.getenv("VTEX_JSON_PROVIDERS", "carrefour,masonline,easy").split(",")
+)
+
+SEARCH_PATH = "/api/catalog_system/pub/products/search"
+
+# La API de catálogo devuelve como máximo 50 productos por pedido (_from/_to)
+PAGE_SIZE = 50
+
+
+def vtex_json_enabled(store: str) -> bool:
+    return store in VTEX_JSON_PROVIDERS and store in VTEX_STORES
+
+
+async def fetch_vtex(store: str, search: str, limit: int):
+    """
+    Busca en la API de catálogo de una tienda VTEX usando el cliente httpx
+    compartido y devuelve los productos con el formato del scraper de esa tienda.
+
+    Devuelve None si la API falla o responde algo inesperado, para que el
+    scraper use Playwright como respaldo. Una búsqueda sin resultados devuelve [].
+    """
+    config = VTEX_STORES[store]
+    url = config["base_url"] + SEARCH_PATH
+
+    start_time = time.time()
+    # más de PAGE_SIZE productos se piden en varias páginas en paralelo
+    total = max(limit, 1)
+    pages = await asyncio.gather(*(
+        _fetch_page(store, url, search, start, min(start + PAGE_SIZE, total) - 1)
+        for start in range(0, total, PAGE_SIZE)
+    ))
+    if any(page is None for page in pages):
+        return None
+    data = [product for page in pages for product in page]
+
+    print(
+        f"[Servidor - VTEX {config['source']}] Tiempo de respuesta de la peticion: {time.time() - start_time:.2f} segundos"
+    )  # <--- solo para logs
+
+    map_product = map_consumer_product if config["shape"] == CONSUMO else map_materiales_product
+    products = []
+    for product in data:
+        if len(products) >= limit:
+            break
+        try:
+            # los SKU sin stock vienen con precio 0: no se devuelven
+            if not _available(_first_offer(product)[1]):
+                continue
+            products.append(map_product(config, product))
+        except (KeyError, IndexError, TypeError, AttributeError) as e:
+            print("Error al mapear producto VTEX:", e)
+    return products
+
+
+async def _fetch_page(store, url, search, start, end):
+    """Una página de la búsqueda (productos `start` a `end` inclusive); None si falla."""
+    params = {"ft": search, "_from": start, "_to": end}
+    headers = {
+        "User-Agent": "Mozilla/5.0",
+        "Accept": "application/json",
+    }
+    try:
+        res = await get_client(url).get(url, params=params, headers=headers)
+        res.raise_for_status()
+        data = res.json()
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning(f"[vtexAdapter] {store}: la API JSON falló, se usa Playwright: {e}")
+        return None
+    return data if isinstance(data, list) else None
+
+
+def _first_offer(product):
+    """Devuelve (item, commertialOffer) del primer SKU con vendedor."""
+    item = (product.get("items") or [{}])[0]
+    sellers = item.get("sellers") or [{}]
+    return item, sellers[0].get("commertialOffer") or {}
+
+
+def _available(offer):
+    price = offer.get("Price")
+    return (
+        offer.get("IsAvailable", True)
+        and offer.get("AvailableQuantity", 1) > 0
+        and isinstance(price, (int, float))
+        and price > 0
+    )
+
+
+def _image_url(item):
+    images = item.get("images") or []
+    return images[0].get("imageUrl") if images else None
+
+
+def _link(config, product):
+    link = product.get("link")
+    if link:
+        return link
+    link_text = product.get("linkText")
+    return f"{config['base_url']}/{link_text}/p" if link_text else None
+
+
+def map_consumer_product(config, product):
+    """Formato de los scrapers de consumo (Carrefour, MásOnline)."""
+    item, offer = _first_offer(product)
+    price = offer.get("Price")
+    return Product(
+        shape=CONSUMO,
+        id=product.get("productId"),
+        image=_image_url(item) or "https://carrefour.com.ar/default-image.svg",
+        link=_link(config, product),
+        name=product.get("productName"),
+        price=price,
+        source=config["source"],
+        unit="unidad",
+        unit_price=price,
+        brand=product.get("brand"),
+    )
+
+
+def map_materiales_product(config, product):
+    """Formato de los scrapers de materiales (Easy)."""
+    item, offer = _first_offer(product)
+    price = offer.get("Price")
+    list_price = offer.get("ListPrice")
+
+    discount = None
+    if price and list_price and list_price > price:
+        discount = str(round((1 - price / list_price) * 100))
+
+    categories = product.get("categories") or []
+    category = categories[0].strip("/").split("/")[-1] if categories else None
+
+    return Product(
+        id=product.get("productId"),
+        name=product.get("productName"),
+        price_text=f"${price:,.0f}".replace(",", ".") if isinstance(price, (int, float)) else None,
+        price=price,
+        image=_image_url(item) or config.get("logo"),
+        link=_link(config, product),
+        stock=1,  # fetch_vtex descarta los que no tienen stock
+        source=config["source"],
+        brand=product.get("brand"),
+        category=category,
+        discount=discount,
+        logo=config.get("logo"),
+    )
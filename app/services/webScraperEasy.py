@@ -1,7 +1,11 @@
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from app.services.htmlParser import make_soup, only
+from app.services.browserPool import lease
+from app.services.vtexAdapter import fetch_vtex, vtex_json_enabled
+from app.services.parsePool import parse_in_pool
+from app.services.jsonExtract import iter_tag_attr, json_first
 from itertools import zip_longest
 from app.services.decorator import with_timeout_and_log
+from app.services.product import Product
 import asyncio, json, time
 
 @with_timeout_and_log(timeout=25)
@@ -14,19 +18,24 @@ async def fetch_data_layer_items(search: str, limit: int = 20):
     
     if (len(search) < 3): # esto previene busquedas innecesarias para palabras menores de 3
         return []
+
+    # Camino rápido: API JSON de VTEX por HTTP; Playwright queda como respaldo
+    if vtex_json_enabled("easy"):
+        products = await fetch_vtex("easy", search, limit)
+        if products is not None:
+            return products
+
     search = search.replace(" ","%20")
     
     # Construye la URL de búsqueda con parámetros específicos para Easy
     url = f"https://www.easy.com.ar/{search}?_q={search}&map=ft"
     start_time = time.time()  # <--- inicio del timer
-    # Inicia Playwright en modo asincrónico
-    async with async_playwright() as p:
-        try:
-            browser = await p.chromium.launch(headless=True)  # Sin interfaz gráfica
-            page = await browser.new_page()
-
-            # Navega a la URL y espera que la red esté inactiva (carga completa)
-            await page.goto(url, wait_until="networkidle", timeout=60000)
+    # Toma una página del pool de Chromium (el navegador ya está lanzado)
+    try:
+        async with lease("easy") as page:
+            # Navega a la URL; no hace falta esperar a que la red quede inactiva
+            # porque a continuación se espera el contenedor de productos
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
 
             # Espera explícita a que aparezca el contenedor de productos
             await page.wait_for_selector("#gallery-layout-container", timeout=20000)
@@ -34,17 +43,33 @@ async def fetch_data_layer_items(search: str, limit: int = 20):
             # Captura el HTML renderizado y el objeto JavaScript `dataLayer`
             html = await page.content()
             data_layer = await page.evaluate("window.dataLayer")
+    except Exception as e:
 
-            # Cierra el navegador para liberar recursos
-            await browser.close()
-        except Exception as e:
-        
-            # return []
-            raise RuntimeError(f"No se encontró el contenedor de productos: {e}")
+        # return []
+        raise RuntimeError(f"No se encontró el contenedor de productos: {e}")
+
+
+    end_time = time.time()  # <--- fin del timer
+    print(
+        f"[Servidor - Easy] Tiempo de respuesta de la peticion: {end_time - start_time:.2f} segundos"
+    )  # <--- solo para logs
 
+    # Parseo y extracción fuera del event loop (pool de procesos si está configurado)
+    return await parse_in_pool(parse_products, html, data_layer, limit)
 
-    # Parsea el HTML con BeautifulSoup
-    soup = BeautifulSoup(html, "html.parser")
+def parse_products(html, data_layer, limit):
+    """
+    Parsea el HTML renderizado de Easy junto con su `dataLayer` y devuelve hasta
+    `limit` productos. Es una función de módulo para poder ejecutarse en el pool de procesos.
+    """
+    # Camino rápido: impresiones del dataLayer + links/imágenes leídos del HTML crudo
+    if json_first("easy"):
+        products = extract_products_json(html, data_layer, limit)
+        if products is not None:
+            return products
+
+    # Parsea solo el subárbol de productos
+    soup = make_soup(html, "easy", only("div", id="gallery-layout-container"))
 
     # Busca el contenedor principal de productos
     product_divs = soup.find("div", id="gallery-layout-container")
@@ -53,12 +78,7 @@ async def fetch_data_layer_items(search: str, limit: int = 20):
         return []
 
     # Buscar el primer bloque con ecommerce.impressions
-    list_products = []
-    for entry in data_layer:
-        ecommerce = entry.get("ecommerce")
-        if ecommerce and "impressions" in ecommerce:
-            list_products = ecommerce["impressions"]
-            break
+    list_products = find_impressions(data_layer)
     
     if not list_products:
         return []
@@ -72,10 +92,6 @@ async def fetch_data_layer_items(search: str, limit: int = 20):
     # limite de respuesta
     products_div = products_div[:limit]
     list_products = list_products[:limit]
-    end_time = time.time()  # <--- fin del timer
-    print(
-        f"[Servidor - Easy] Tiempo de respuesta de la peticion: {end_time - start_time:.2f} segundos"
-    )  # <--- solo para logs
 
     for product_div, product_js in zip_longest(products_div, list_products):
         # print(product_div)
@@ -86,6 +102,49 @@ async def fetch_data_layer_items(search: str, limit: int = 20):
 
     return products
 
+def find_impressions(data_layer):
+    """Devuelve la lista `ecommerce.impressions` del primer bloque del dataLayer que la tenga."""
+    for entry in data_layer or []:
+        ecommerce = entry.get("ecommerce") if isinstance(entry, dict) else None
+        if ecommerce and "impressions" in ecommerce:
+            return ecommerce["impressions"]
+    return []
+
+def extract_products_json(html, data_layer, limit):
+    """
+    Arma los productos desde `ecommerce.impressions` del dataLayer, tomando link
+    e imagen de las etiquetas de la galería en el mismo orden, sin armar el árbol.
+    Devuelve None si falta algo, para usar el camino por DOM.
+    """
+    list_products = find_impressions(data_layer)[:limit]
+    if not list_products:
+        return None
+
+    links = list(iter_tag_attr(html, "a", "vtex-product-summary-2-x-clearLink", "href"))[:limit]
+    images = list(iter_tag_attr(html, "img", "vtex-product-summary-2-x-imageNormal", "src"))[:limit]
+    if len(links) != len(list_products) or len(images) != len(list_products):
+        return None
+
+    default_image_url = "https://arcencohogareasy.vtexassets.com/assets/vtex.file-manager-graphql/images/e3cfab5b-2965-44d0-9c58-c3f3ca4b2bac___73d2acbdf5bcfbbcf7de22ba69d9163e.svg"
+    products = []
+    for product_js, href, image_url in zip(list_products, links, images):
+        price_number = product_js.get("price")
+        products.append(Product(
+            id=product_js.get("id"),
+            name=product_js.get("name"),
+            price_text=f"${price_number:,.0f}".replace(",", ".") if isinstance(price_number, (int, float)) else None,
+            price=price_number,
+            image=image_url or default_image_url,
+            link=f"https://www.easy.com.ar{href}" if href else "#",
+            stock=1,
+            source="Easy",
+            brand=product_js.get("brand"),
+            category=product_js.get("category"),
+            discount=None,
+            logo=default_image_url,
+        ))
+    return products
+
 def extract_product_data(product_div, product_js):
     """Extrae y fusiona datos de un producto desde el HTML y el dataLayer."""
     
@@ -147,20 +206,20 @@ def extract_product_data(product_div, product_js):
         # Stock (por defecto 1 si aparece en la galería)
         stock = 1
 
-        return {
-            "product_id": product_id,
-            "name": name,
-            "price_short": price_short,
-            "price_number": price_number,
-            "image_url": image_url,
-            "link": link,
-            "stock": stock,
-            "source": "Easy",
-            "brandName": brandName,
-            "category": category,
-            "discountPercentage": discountPercentage,
-            "logo": default_image_url
-        }
+        return Product(
+            id=product_id,
+            name=name,
+            price_text=price_short,
+            price=price_number,
+            image=image_url,
+            link=link,
+            stock=stock,
+            source="Easy",
+            brand=brandName,
+            category=category,
+            discount=discountPercentage,
+            logo=default_image_url,
+        )
 
     except Exception as e:
         print("Error procesando producto:", e)
@@ -1,8 +1,11 @@
-from bs4 import BeautifulSoup
+from app.services.htmlParser import make_soup, only
 import httpx
 import json
 import re
 from app.services.decorator import with_timeout_and_log
+from app.services.httpClient import get_client
+from app.services.jsonExtract import find_script_json, iter_tag_attr, json_first
+from app.services.product import Product
 import asyncio, json, time
 
 @with_timeout_and_log(timeout=20)
@@ -15,7 +18,7 @@ async def fetch_data_items_forte(search: str, limit: int = 15):
         search (str): Término de búsqueda.
 
     Returns:
-        List[dict]: Lista de productos encontrados con sus datos normalizados.
+        List[Product]: Lista de productos encontrados con sus datos normalizados.
     """
     # ejemplo de una url de busqueda completa de la pagina
     # https://www.forteindustrial.com.ar/search/?q=cemento&manufacturer=CASABLANCA&vv_use=Exterior&vv_color=Cemento&vv_superficial=Mate&vv_material=Acr%C3%ADlico&type=configurable~simple
@@ -33,12 +36,18 @@ async def fetch_data_items_forte(search: str, limit: int = 15):
     start_time = time.time()  # <--- inicio del timer
     try:
         # Solicitar la página web
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, headers=headers)
-            res.raise_for_status()
+        client = get_client(url)
+        res = await client.get(url, headers=headers)
+        res.raise_for_status()
 
-        # Parsear el HTML de la página
-        soup = BeautifulSoup(res.text, "html.parser")
+        # Camino rápido: items del ga4DataLayer leídos del HTML crudo, sin armar el árbol
+        if json_first("forte"):
+            products = extract_products_json(res.content, limit)
+            if products is not None:
+                return products
+
+        # Parsear solo el subárbol de productos de la página
+        soup = make_soup(res.text, "forte", only(["ol", "script"]))
 
         # Buscar todos los elementos <div> que contienen la información del producto
         products_ol = soup.find("ol", class_="products")
@@ -82,7 +91,47 @@ async def fetch_data_items_forte(search: str, limit: int = 15):
 
     except httpx.RequestError as e:
         print("Error de conexión:", e)
-        return []
+        raise
+
+def extract_products_json(raw, limit):
+    """
+    Extrae los productos del JSON `ga4DataLayer` del HTML crudo; la imagen y el
+    link salen de las etiquetas de cada item, leídas en el mismo orden.
+    Devuelve None si falta algo, para usar el camino por DOM.
+    """
+    parsed = find_script_json(raw, "ga4DataLayer")
+    if not parsed:
+        return None
+    try:
+        list_products = parsed["*"]["ga4DataLayer"]["data"][0]["ecommerce"]["items"][:limit]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+    links = list(iter_tag_attr(raw, "a", "product-item-link", "href"))[:limit]
+    images = list(iter_tag_attr(raw, "img", "product-image-photo", "srcset"))[:limit]
+    # sin un link por producto no se puede emparejar con seguridad
+    if len(links) != len(list_products) or len(images) != len(list_products):
+        return None
+
+    default_image_url = "https://media.xcons.com.ar/media/logo/stores/137/new-logo-desktop.webp"
+    products = []
+    for product_js, link, srcset in zip(list_products, links, images):
+        product_id = product_js.get("item_id")
+        products.append(Product(
+            id=product_id,
+            name=product_js.get("item_name"),
+            price_text=product_js.get("price"),
+            price=product_js.get("price"),
+            image=srcset.split(" ")[0].strip() if srcset else None,
+            link=link,
+            stock=1,
+            source="Forte",
+            brand=product_id.split('-')[0] if product_id else None,
+            category=product_js.get("item_category_3"),
+            discount=None,
+            logo=default_image_url,
+        ))
+    return products
 
 def extract_product_data(product_li, product_js):
     """
@@ -93,17 +142,8 @@ def extract_product_data(product_li, product_js):
         Contenedor HTML del producto (debe ser un <div> que contenga los elementos esperados).
 
     Returns:
-    dict
-        Un diccionario con la siguiente estructura:
-        {
-            "product_id": str | None,
-            "name": str | None,
-            "price_short": str | None,
-            "price_number": float | None,
-            "image_url": str,
-            "link": str | None,
-            "stock": int | None
-        }
+    Product
+        El producto con sus datos normalizados (ver app/services/product.py).
     """
 
     # Inicializar valores por defecto
@@ -128,21 +168,20 @@ def extract_product_data(product_li, product_js):
         print("Error encontrado: ", e )
         pass
 
-    return {
-        "product_id": product_id,
-        "name": name,
-        "price_short": price_short,
-        "price_number": price_number,
-        "image_url": image_url,
-        "link": link,
-        "stock": stock,
-        "source":"Forte",
-        "brandName": brandName,
-        "category": category,
-        "discountPercentage": discountPercentage,
-        "logo":"https://media.xcons.com.ar/media/logo/stores/137/new-logo-desktop.webp"  
-    
-    }
+    return Product(
+        id=product_id,
+        name=name,
+        price_text=price_short,
+        price=price_number,
+        image=image_url,
+        link=link,
+        stock=stock,
+        source="Forte",
+        brand=brandName,
+        category=category,
+        discount=discountPercentage,
+        logo="https://media.xcons.com.ar/media/logo/stores/137/new-logo-desktop.webp",
+    )
     
 # Ejecutar como script para probar
 # if __name__ == "__main__":
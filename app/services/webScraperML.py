@@ -1,9 +1,19 @@
 import httpx                        # Para hacer solicitudes HTTP
-from bs4 import BeautifulSoup       # Para parsear el HTML
+from app.services.htmlParser import make_soup, only
 import json                         # Para imprimir en formato JSON
 import asyncio, time
 from app.services.metodosGenericos import ordenar_por_campo
 from app.services.decorator import with_timeout_and_log
+from app.services.httpClient import get_client
+from app.services.parsePool import parse_in_pool
+from app.services.product import Product
+
+# Cookies necesarias, fijas en el cliente de Mercado Libre (la búsqueda va en la URL)
+COOKIES = {
+    '_csrf': 'Z1x5THU_ZjBs1KrLAFu8UNYC',
+    '_d2id': 'fe9b98ad-29ea-470b-a686-9ceba6db7130-n',
+    'cp': '9000%7C1757137443319'
+}
 
 @with_timeout_and_log(timeout=20)
 async def fetch_data_items_ml(search: str, limit: int = 30, campo = "name" ,descendente = False):
@@ -15,7 +25,7 @@ async def fetch_data_items_ml(search: str, limit: int = 30, campo = "name" ,desc
         search (str): Término de búsqueda.
 
     Returns:
-        List[dict]: Lista de productos encontrados con sus datos normalizados.
+        List[Product]: Lista de productos encontrados con sus datos normalizados.
     """
     # remplaza los espacios con el simbolo '+' para una busqueda más efectiva y necesario para esta pagina en particular
     search = search.lower();
@@ -29,13 +39,6 @@ async def fetch_data_items_ml(search: str, limit: int = 30, campo = "name" ,desc
     # url = f"https://listado.mercadolibre.com.ar/construccion/materiales-obra/obra-pesada/{search}_NoIndex_True?sb=category#D[A:{search_text}]" 
     url = f"https://listado.mercadolibre.com.ar/{search}#D[A:{search}]"
     start_time = time.time()  # <--- inicio del timer
-    # Definis tus cookies necesarias
-    cookies = {
-        'last_query': search,
-        '_csrf': 'Z1x5THU_ZjBs1KrLAFu8UNYC',
-        '_d2id': 'fe9b98ad-29ea-470b-a686-9ceba6db7130-n',
-        'cp': '9000%7C1757137443319'
-    }
     
     # Definicion de headers
     headers = {
@@ -46,35 +49,43 @@ async def fetch_data_items_ml(search: str, limit: int = 30, campo = "name" ,desc
     }
     try:
         # Solicitar la página web
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, headers=headers, cookies=cookies)
-            res.raise_for_status()
-
-        # Parsear el HTML de la página
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        # Buscar todos los elementos <div> que contienen la información del producto
-        product_ol = soup.find("ol", class_="ui-search-layout")
+        client = get_client(url, cookies=COOKIES)
+        res = await client.get(url, headers=headers)
+        res.raise_for_status()
 
-        products = []
         end_time = time.time()  # <--- fin del timer
         print(
             f"[Servidor - ML] Tiempo de respuesta de la peticion: {end_time - start_time:.2f} segundos"
         )  # <--- solo para logs
 
-        for product_li in product_ol.find_all("li", class_="ui-search-layout__item")[:limit]:
-            # print(product_li.find("a", class_="poly-component__title").text.strip())
-            # # break
-            product_data = extract_product_data(product_li)
-            if product_data:
-                products.append(product_data)
+        # Parseo y extracción fuera del event loop (pool de procesos si está configurado)
+        products = await parse_in_pool(parse_products, res.content, limit)
 
         return ordenar_por_campo(products, campo, descendente)
 
     except httpx.RequestError as e:
         print("Error de conexión:", e)
+        raise
+
+def parse_products(html, limit):
+    """
+    Parsea el HTML crudo del listado de Mercado Libre y devuelve hasta `limit` productos.
+    Es una función de módulo para poder ejecutarse en el pool de procesos.
+    """
+    soup = make_soup(html, "meli", only("ol", class_="ui-search-layout"))
+
+    # Buscar la lista <ol> que contiene los productos
+    product_ol = soup.find("ol", class_="ui-search-layout")
+    if not product_ol:
         return []
 
+    products = []
+    for product_li in product_ol.find_all("li", class_="ui-search-layout__item")[:limit]:
+        product_data = extract_product_data(product_li)
+        if product_data:
+            products.append(product_data)
+    return products
+
 def extract_product_data(product_li):
     """
     Extrae la información relevante de un producto desde un contenedor HTML.
@@ -84,20 +95,8 @@ def extract_product_data(product_li):
         Contenedor HTML del producto (debe ser un <div> que contenga los elementos esperados).
 
     Returns:
-    dict
-        Un diccionario con la siguiente estructura:
-        {
-            "product_id": str | None,
-            "name": str | None,
-            "price_short": str | None,
-            "price_number": float | None,
-            "image_url": str,
-            "link": str | None,
-            "stock": int | None,
-            "brandName": str | None,
-            "category": str | None,
-            "discountPercentage": int | None,
-        }
+    Product
+        El producto con sus datos normalizados (ver app/services/product.py).
     """
 
     # Inicializar valores por defecto
@@ -141,34 +140,20 @@ def extract_product_data(product_li):
         print("Error encontrado: ", e )
         pass
 
-    return {
-        "product_id": product_id,
-        "name": name,
-        "price_short": price_short,
-        "price_number": price_number,
-        "image_url": image_url,
-        "link": link,
-        "stock": stock,
-        "source":"Mercado Libre",
-        "brandName": brandName,
-        "category": category,
-        "discountPercentage": discountPercentage,
-        "logo":"https://acdn-us.mitiendanube.com/stores/001/258/599/themes/common/logo-1636121110-1663682413-ff5e07835dc96cbf78797acba0239c841663682413-480-0.webp"  
-    }
-
-def ordenar_por_campo(lista, campo, descendente=False):
-    """
-    Ordena una lista de objetos (dicts) por el campo especificado.
-    Si el campo no existe o es None, lo pone al final.
-    """
-    def clave(obj):
-        valor = obj.get(campo)
-        if isinstance(valor, str) and valor.replace(".", "").isdigit():
-            return float(valor.replace(".", ""))
-        return valor if valor is not None else float('inf') if not descendente else float('-inf')
-
-    return sorted(lista, key=clave, reverse=descendente)
-
+    return Product(
+        id=product_id,
+        name=name,
+        price_text=price_short,
+        price=price_number,
+        image=image_url,
+        link=link,
+        stock=stock,
+        source="Mercado Libre",
+        brand=brandName,
+        category=category,
+        discount=discountPercentage,
+        logo="https://acdn-us.mitiendanube.com/stores/001/258/599/themes/common/logo-1636121110-1663682413-ff5e07835dc96cbf78797acba0239c841663682413-480-0.webp",
+    )
 
 # Ejecutar como script para probar
 # if __name__ == "__main__":
@@ -1,9 +1,14 @@
 import httpx                        # Para hacer solicitudes HTTP
-from bs4 import BeautifulSoup       # Para parsear el HTML
+from app.services.htmlParser import make_soup, only
 import json                         # Para imprimir en formato JSON
 from app.services.decorator import with_timeout_and_log
+from app.services.httpClient import get_client
+from app.services.jsonExtract import json_first, tiendanube_products
+from app.services.product import Product
 import asyncio, json, time
 
+LOGO = "https://acdn-us.mitiendanube.com/stores/001/258/599/themes/common/logo-1636121110-1663682413-ff5e07835dc96cbf78797acba0239c841663682413-480-0.webp"
+
 @with_timeout_and_log(timeout=20)
 async def fetch_data_items_montessi(search: str, limit: int = 15):
     """
@@ -14,7 +19,7 @@ async def fetch_data_items_montessi(search: str, limit: int = 15):
         search (str): Término de búsqueda.
 
     Returns:
-        List[dict]: Lista de productos encontrados con sus datos normalizados.
+        List[Product]: Lista de productos encontrados con sus datos normalizados.
     """
     # remplaza los espacios con el simbolo '+' para una busqueda más efectiva y necesario para esta pagina en particular
     search = search.replace(" ","+")
@@ -30,12 +35,18 @@ async def fetch_data_items_montessi(search: str, limit: int = 15):
 
     try:
         # Solicitar la página web
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, headers=headers)
-            res.raise_for_status()
+        client = get_client(url)
+        res = await client.get(url, headers=headers)
+        res.raise_for_status()
+
+        # Camino rápido: JSON embebido en la página, sin armar el árbol HTML
+        if json_first("montessi"):
+            products = tiendanube_products(res.content, limit, "Mottesi Materiales", LOGO)
+            if products is not None:
+                return products
 
-        # Parsear el HTML de la página
-        soup = BeautifulSoup(res.text, "html.parser")
+        # Parsear solo el subárbol de productos de la página
+        soup = make_soup(res.text, "montessi", only("div", class_="js-item-product"))
 
         # Buscar todos los elementos <div> que contienen la información del producto
         product_divs = soup.find_all("div", class_="js-item-product")
@@ -57,7 +68,7 @@ async def fetch_data_items_montessi(search: str, limit: int = 15):
 
     except httpx.RequestError as e:
         print("Error de conexión:", e)
-        return []
+        raise
 
 def extract_product_data(product_div):
     """
@@ -68,25 +79,13 @@ def extract_product_data(product_div):
         Contenedor HTML del producto (debe ser un <div> que contenga los elementos esperados).
 
     Returns:
-    dict
-        Un diccionario con la siguiente estructura:
-        {
-            "product_id": str | None,
-            "name": str | None,
-            "price_short": str | None,
-            "price_number": float | None,
-            "image_url": str,
-            "link": str | None,
-            "stock": int | None,
-            "brandName": str | None,
-            "category": str | None,
-            "discountPercentage": int | None,
-        }
+    Product
+        El producto con sus datos normalizados (ver app/services/product.py).
     """
 
     # Inicializar valores por defecto
     product_id = name = price_short = price_number = link = stock = brandName = discountPercentage = category = None
-    default_image_url = "https://acdn-us.mitiendanube.com/stores/001/258/599/themes/common/logo-1636121110-1663682413-ff5e07835dc96cbf78797acba0239c841663682413-480-0.webp"
+    default_image_url = LOGO
     image_url = default_image_url
 
     try:
@@ -125,20 +124,20 @@ def extract_product_data(product_div):
         print("Error encontrado: ", e )
         pass
 
-    return {
-        "product_id": product_id,
-        "name": name,
-        "price_short": price_short,
-        "price_number": price_number,
-        "image_url": image_url,
-        "link": link,
-        "stock": stock,
-        "source":"Mottesi Materiales",
-        "brandName": brandName,
-        "category": category,
-        "discountPercentage": discountPercentage,
-        "logo":"https://acdn-us.mitiendanube.com/stores/001/258/599/themes/common/logo-1636121110-1663682413-ff5e07835dc96cbf78797acba0239c841663682413-480-0.webp"  
-    }
+    return Product(
+        id=product_id,
+        name=name,
+        price_text=price_short,
+        price=price_number,
+        image=image_url,
+        link=link,
+        stock=stock,
+        source="Mottesi Materiales",
+        brand=brandName,
+        category=category,
+        discount=discountPercentage,
+        logo=LOGO,
+    )
 
 
 # # Ejecutar como script para probar
@@ -2,6 +2,12 @@ from app import create_app
 from flask_cors import CORS
 from app.routes.products import products
 from app.routes.consumerProducts import consumerProducts
+from app.services.cache import result_cache
+from app.services.singleFlight import single_flight
+from app.services.resultStore import result_store
+from app.services.timeouts import timeout_manager
+from app.services.circuitBreaker import circuit_breakers
+from app.services.hedging import hedge_budget
 # from flasgger import Swagger
 
 app = create_app()
@@ -25,6 +31,18 @@ def health():
     return {"status": "ok"}, 200
 
 
+@app.route("/stats")
+def stats():
+    return {
+        "cache": result_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "store": result_store.stats() if result_store is not None else None,
+        "timeouts": timeout_manager.stats(),
+        "breakers": circuit_breakers.stats(),
+        "hedging": hedge_budget.stats(),
+    }, 200
+
+
 # Router index
 @app.get("/")
 def index():
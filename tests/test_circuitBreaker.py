@@ -0,0 +1,40 @@
+import socket
+import unittest
+from unittest import mock
+
+from app.services import webScraperSagosa
+from app.services.backgroundLoop import run_sync
+from app.services.circuitBreaker import BREAKER_CONFIG, CircuitOpenError, circuit_breakers
+from app.services.providerRunner import run_provider
+
+
+def _closed_port():
+    # puerto libre en localhost: al cerrarlo las conexiones se rechazan
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class CircuitBreakerConnectionRefusedTest(unittest.TestCase):
+
+    def test_breaker_opens_when_provider_refuses_connections(self):
+        store = {**webScraperSagosa.STORE, "search_url": f"http://127.0.0.1:{_closed_port()}/busqueda"}
+        scraper = webScraperSagosa.fetch_data_items_sagosa
+        provider = "sagosa-rechaza-conexiones"
+
+        with mock.patch.object(webScraperSagosa, "STORE", store):
+            # quien llama al scraper directo sigue recibiendo []
+            self.assertEqual(run_sync(scraper("cemento", 5)), [])
+
+            for _ in range(BREAKER_CONFIG["failure_threshold"]):
+                with self.assertRaises(Exception) as ctx:
+                    run_sync(run_provider(provider, scraper, "cemento", 5, use_cache=False))
+                self.assertNotIsInstance(ctx.exception, CircuitOpenError)
+
+            self.assertEqual(circuit_breakers.stats()[provider]["state"], "open")
+            with self.assertRaises(CircuitOpenError):
+                run_sync(run_provider(provider, scraper, "cemento", 5, use_cache=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from app.services.clustering import cluster_products
+from app.services.product import Product
+
+
+def _product(name, brand, price, source):
+    return Product(name=name, brand=brand, price=price, source=source, link=f"https://{source}/{price}")
+
+
+class ClusterProductsTest(unittest.TestCase):
+
+    def test_groups_same_product_across_providers(self):
+        items = [
+            _product("Cemento Loma Negra 50kg", "Marca no encontrada", 100, "Mottesi"),
+            _product("Cemento Loma Negra x 50 kg", "Loma Negra", 90, "Sagosa"),
+            _product("Cemento Loma Negra 50 Kg", None, 95, "Perren"),
+        ]
+        result = cluster_products(items)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].source, "Sagosa")
+        self.assertEqual(result[0].offers, 3)
+        self.assertEqual({a["source"] for a in result[0].alternatives}, {"Mottesi", "Perren"})
+
+    def test_placeholder_brand_does_not_join_different_brands(self):
+        items = [
+            _product("Cemento Portland 50kg", "Loma Negra", 100, "Sagosa"),
+            _product("Cemento Portland 50kg", "Marca no encontrada", 95, "Mottesi"),
+            _product("Cemento Portland 50kg", "Holcim", 80, "Perren"),
+        ]
+        result = cluster_products(items)
+        brands = [(p.brand, p.offers) for p in result]
+        self.assertEqual(len(result), 2)
+        self.assertIn(("Holcim", 1), brands)
+
+    def test_does_not_group_products_of_the_same_provider(self):
+        items = [
+            _product("Cemento Loma Negra 50kg", None, 100, "Mottesi"),
+            _product("Cemento Loma Negra 50kg", None, 98, "Mottesi"),
+        ]
+        result = cluster_products(items)
+        self.assertEqual([p.offers for p in result], [1, 1])
+
+    def test_different_sizes_stay_apart(self):
+        items = [
+            _product("Cemento Loma Negra 25kg", None, 60, "Mottesi"),
+            _product("Cemento Loma Negra 50kg", None, 100, "Sagosa"),
+        ]
+        self.assertEqual(len(cluster_products(items)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
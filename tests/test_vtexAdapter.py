@@ -0,0 +1,120 @@
+import asyncio
+import json
+import threading
+import unittest
+from contextlib import asynccontextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from app.services import vtexAdapter
+from app.services.scraperProducts import webScraperCarrefour
+
+
+def _vtex_product(index, price=100.0, quantity=10):
+    return {
+        "productId": str(index),
+        "productName": f"Producto {index}",
+        "brand": "Marca",
+        "linkText": f"producto-{index}",
+        "items": [{
+            "images": [{"imageUrl": f"https://img/{index}.jpg"}],
+            "sellers": [{"commertialOffer": {
+                "Price": price if quantity else 0,
+                "ListPrice": price,
+                "AvailableQuantity": quantity,
+                "IsAvailable": bool(quantity),
+            }}],
+        }],
+    }
+
+
+class _StubVtex(BaseHTTPRequestHandler):
+    """API de catálogo VTEX falsa: 80 productos, el 2 sin stock."""
+
+    requests = []
+    fail = False
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        start, end = int(query["_from"][0]), int(query["_to"][0])
+        type(self).requests.append((start, end))
+        if type(self).fail or end - start + 1 > vtexAdapter.PAGE_SIZE:
+            self.send_response(500)
+            self.end_headers()
+            return
+        products = [
+            _vtex_product(i, quantity=0 if i == 2 else 10)
+            for i in range(start, min(end + 1, 80))
+        ]
+        body = json.dumps(products).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class VtexAdapterTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubVtex)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        stores = {
+            name: {**config, "base_url": base_url}
+            for name, config in vtexAdapter.VTEX_STORES.items()
+        }
+        cls.patcher = mock.patch.object(vtexAdapter, "VTEX_STORES", stores)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _StubVtex.requests = []
+        _StubVtex.fail = False
+
+    def test_splits_large_limits_into_pages(self):
+        products = asyncio.run(vtexAdapter.fetch_vtex("carrefour", "arroz", 60))
+        self.assertEqual(sorted(_StubVtex.requests), [(0, 49), (50, 59)])
+        self.assertEqual(len(products), 59)  # el producto 2 no tiene stock
+
+    def test_skips_unavailable_offers(self):
+        products = asyncio.run(vtexAdapter.fetch_vtex("easy", "cemento", 5))
+        self.assertEqual([p.id for p in products], ["0", "1", "3", "4"])
+        self.assertTrue(all(p.price > 0 for p in products))
+
+    def test_api_failure_falls_back_to_playwright(self):
+        _StubVtex.fail = True
+        self.assertIsNone(asyncio.run(vtexAdapter.fetch_vtex("carrefour", "arroz", 10)))
+
+        leases = []
+
+        class FakePage:
+            async def goto(self, url, timeout=None):
+                pass
+
+            async def content(self):
+                return "<html><body></body></html>"
+
+        @asynccontextmanager
+        async def fake_lease(provider=None, **options):
+            leases.append(provider)
+            yield FakePage()
+
+        with mock.patch.object(webScraperCarrefour, "lease", fake_lease):
+            products = asyncio.run(webScraperCarrefour.fetch_data_layer_items("arroz", 10))
+        self.assertEqual(leases, ["carrefour"])
+        self.assertEqual(products, [])
+
+
+if __name__ == "__main__":
+    unittest.main()